@@ -0,0 +1,59 @@
+"""Compare the old per-chart derived columns with enrich.enrich_hour.
+
+Usage: python benchmarks/bench_enrich.py [--replicate 10] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_cache  # noqa: E402
+import enrich  # noqa: E402
+
+
+def legacy_enrich(hour_df):
+    # The column-by-column mutations app.py used to run on every rerun, less
+    # the heatmap bins, which enrich_hour no longer computes either
+    hour_df = hour_df.copy()
+    weekday_mapping = dict(enumerate(enrich.WEEKDAY_NAMES))
+    hour_df["weekday"] = hour_df["weekday"].map(weekday_mapping)
+    hour_df["weekday"] = pd.Categorical(hour_df["weekday"], categories=enrich.WEEKDAY_NAMES, ordered=True)
+    hour_df["day_type"] = hour_df.apply(lambda row:
+                                        "Holiday" if row["holiday"] == 1 else
+                                        ("Weekend" if row["weekday"] in [0, 6] else "Workday"), axis=1)
+    hour_df["month_name"] = hour_df["mnth"].map(dict(enumerate(enrich.MONTH_NAMES, start=1)))
+    hour_df["weathersit_name"] = hour_df["weathersit"].map(dict(enumerate(enrich.WEATHER_NAMES, start=1)))
+    hour_df["season_name"] = hour_df["season"].map(dict(enumerate(enrich.SEASON_NAMES, start=1)))
+    return hour_df
+
+
+def best_of(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicate", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hour_df = data_cache.read_csv("hour.csv")
+    hour_df = pd.concat([hour_df] * args.replicate, ignore_index=True)
+    legacy = best_of(legacy_enrich, hour_df, args.repeat)
+    vectorized = best_of(enrich.enrich_hour, hour_df, args.repeat)
+    print(f"rows:       {len(hour_df):,}")
+    print(f"legacy:     {legacy * 1000:9.1f} ms")
+    print(f"vectorized: {vectorized * 1000:9.1f} ms")
+    print(f"speedup:    {legacy / vectorized:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Time every stage of the data pipeline on synthetic data of growing size.
+
+Each scale runs in its own subprocess on a synthetic day.csv/hour.csv with the
+UCI schema and `scale` times the rows, so its peak RSS is measured in
+isolation. The report is written as JSON and, when a baseline report exists,
+compared stage by stage against it.
+
+Usage: python benchmarks/bench_pipeline.py [--scales 1,10,100] [--baseline PATH]
+                                           [--save-baseline] [--tolerance 1.25]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import cube  # noqa: E402
+import data_cache  # noqa: E402
+import enrich  # noqa: E402
+import features  # noqa: E402
+import figures  # noqa: E402
+import heatmap  # noqa: E402
+import partitioned  # noqa: E402
+import profiler  # noqa: E402
+import row_index  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+# Stages faster than this in the baseline are too noisy to flag
+MIN_COMPARED_SECONDS = 0.05
+
+
+def synthetic(df, scale, seed=42):
+    """`scale` copies of `df` with jittered weather and counts, same columns and dtypes."""
+    rng = np.random.default_rng(seed)
+    out = df.loc[np.tile(np.arange(len(df)), scale)].reset_index(drop=True)
+    n = len(out)
+    out["instant"] = np.arange(1, n + 1)
+    for col in ("temp", "atemp", "hum", "windspeed"):
+        out[col] = np.clip(out[col] + rng.normal(0, 0.02, n), 0, 1).round(4)
+    for col in ("casual", "registered"):
+        out[col] = np.maximum(0, np.round(out[col] * rng.lognormal(0, 0.1, n))).astype(np.int64)
+    out["cnt"] = out["casual"] + out["registered"]
+    return out
+
+
+def write_inputs(workdir, scale, seed):
+    for name in ("day.csv", "hour.csv"):
+        df = pd.read_csv(os.path.join(ROOT, name))
+        synthetic(df, scale, seed).to_csv(os.path.join(workdir, name), index=False)
+
+
+def run_stages(workdir, max_fit_rows, fit_models):
+    day_csv, hour_csv = os.path.join(workdir, "day.csv"), os.path.join(workdir, "hour.csv")
+    stage = profiler.stage
+    profiler.start_run()
+    with stage("read csv"):
+        data_cache.read_csv(day_csv), data_cache.read_csv(hour_csv)
+    with stage("feather build"):
+        data_cache.build(day_csv), data_cache.build(hour_csv)
+    with stage("feather load"):
+        day_df, hour_df = data_cache.load_frames(day_csv, hour_csv)
+    with stage("enrich"):
+        day_df, hour_df = enrich.enrich_day(day_df), enrich.enrich_hour(hour_df)
+    with stage("cube build"):
+        day_cube = cube.build_cube(day_df, cube.DAY_DIMS)
+        hour_cube = cube.build_cube(hour_df, cube.HOUR_DIMS)
+    with stage("groupby hr x weekday (rows)"):
+        hour_df.groupby(["hr", "weekday_name"], observed=True)["cnt"].mean()
+    with stage("groupby hr x weekday (cube)"):
+        cube.rollup(hour_cube, ["hr", "weekday_name"], ["cnt"])
+    with stage("filter index build"):
+        hour_index, cube_index = row_index.build(hour_df), row_index.build(hour_cube)
+    selection = {"yr": [1], "season": [1, 3, 4], "weathersit": [1, 2]}
+    with stage("filter select (rows)"):
+        row_index.take(hour_df, row_index.select(hour_index, selection))
+    with stage("filter select + rollup (cube)"):
+        cube.rollup(row_index.take(hour_cube, row_index.select(cube_index, selection)), ["hr", "weekday_name"], ["cnt"])
+    with stage("heatmap grids"):
+        grids = heatmap.accumulate_grids(heatmap.empty_grids(), hour_df)
+    # The same cube and grids from yr/mnth partitions over partitioned.AGG_WORKERS processes
+    with stage("partitioned cube + grids"):
+        partitioned.aggregate_hour(hour_df, min_rows=0)
+    with stage("heatmap coarsen 10 / 40 bins"):
+        heatmap.coarsen(grids["temp:hum"], 10), heatmap.coarsen(grids["temp:hum"], 40)
+
+    # Building and serializing each chart, as a cache miss in figure_cache does
+    charts = {
+        "season_box": (figures.season_box, day_df), "trend": (figures.trend, day_df),
+        "hourly_animated": (figures.hourly_animated, hour_cube),
+        "weekly_trends_line": (figures.weekly_trends_line, day_cube),
+        "weekly_trends_box": (figures.weekly_trends_box, day_df),
+        "hourly_rentals": (figures.hourly_rentals, hour_cube),
+        "facet_interactive": (figures.facet_interactive, hour_cube),
+        "temp_scatter": (figures.temp_scatter, day_df), "humidity_scatter": (figures.humidity_scatter, day_df),
+        "weather_heatmap": (figures.weather_heatmap, grids["temp:hum"]),
+        "wind_scatter": (figures.wind_scatter, hour_df), "weather_box": (figures.weather_box, hour_df),
+        "rental_comparison": (figures.rental_comparison, hour_cube),
+        "seasonal_stacked": (figures.seasonal_stacked, hour_cube),
+    }
+    figure_bytes = {}
+    for name, (builder, data) in charts.items():
+        with stage(f"figure: {name}"):
+            figure_bytes[name] = len(builder(data).to_json())
+
+    fit_rows = 0
+    if fit_models:
+        fit_rows = fit_stages(stage, day_df, hour_df, max_fit_rows)
+    records = profiler.finish_run(log_path=None)
+    return {
+        "rows": {"day": len(day_df), "hour": len(hour_df)},
+        "fit_rows": fit_rows,
+        "stages": {r["stage"]: {"wall_s": r["wall_s"], "cpu_s": r["cpu_s"], "peak_rss_mb": r["peak_rss_mb"]}
+                   for r in records},
+        "figure_bytes": figure_bytes,
+        "peak_rss_mb": profiler.peak_rss_mb(),
+    }
+
+
+def fit_stages(stage, day_df, hour_df, max_fit_rows):
+    from sklearn.cluster import KMeans
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeRegressor
+    from xgboost import XGBRegressor
+
+    # Same features as Part 4, on at most `max_fit_rows` rows
+    if max_fit_rows and len(hour_df) > max_fit_rows:
+        hour_df = hour_df.sample(max_fit_rows, random_state=42)
+    with stage("model features"):
+        encoder = features.fit_encoder(hour_df)
+        X = features.frame(encoder, features.transform(encoder, hour_df), hour_df.index)
+        X_train, X_test, y_train, y_test = train_test_split(X, hour_df['cnt'], test_size=0.2, random_state=42)
+    models = {
+        "Linear Regression": LinearRegression(),
+        "Ridge Regression": Ridge(alpha=1.0),
+        "Decision Tree Regression": DecisionTreeRegressor(max_depth=5),
+        "Random Forest Regression": RandomForestRegressor(n_estimators=100, n_jobs=-1),
+        "Gradient Boosting Regression": GradientBoostingRegressor(n_estimators=100, learning_rate=0.1, max_depth=3),
+        "XGBoost": XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=3),
+    }
+    for name, model in models.items():
+        with stage(f"fit: {name}"):
+            model.fit(X_train, y_train)
+            model.predict(X_test)
+    with stage("fit: KMeans (day)"):
+        day_features = ["temp", "hum", "windspeed", "season", "weekday", "workingday", "weathersit"]
+        KMeans(n_clusters=3, random_state=42, n_init=10).fit(StandardScaler().fit_transform(day_df[day_features]))
+    return len(X_train)
+
+
+def run_scale(scale, args):
+    """Run one scale in a fresh interpreter and return its result dict."""
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scale}x-") as workdir:
+        start = time.perf_counter()
+        write_inputs(workdir, scale, args.seed)
+        generate_s = time.perf_counter() - start
+        env = dict(os.environ, BIKE_DATA_CACHE=os.path.join(workdir, "cache"))
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", workdir,
+               "--max-fit-rows", str(args.max_fit_rows)]
+        if args.skip_models:
+            cmd.append("--skip-models")
+        proc = subprocess.run(cmd, env=env, cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{scale}x failed:\n{proc.stderr}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["generate_s"] = generate_s
+    return result
+
+
+def environment():
+    import sklearn
+    import xgboost
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "numpy": np.__version__, "pandas": pd.__version__,
+            "sklearn": sklearn.__version__, "xgboost": xgboost.__version__}
+
+
+def compare(report, baseline, tolerance):
+    """Print current vs baseline per stage; return the regressions."""
+    regressions = []
+    print(f"\n{'scale':>6}  {'stage':<40} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for scale, result in report["results"].items():
+        base = baseline["results"].get(scale)
+        if base is None:
+            continue
+        rows = [(stage, base["stages"][stage]["wall_s"], timing["wall_s"])
+                for stage, timing in result["stages"].items() if stage in base["stages"]]
+        rows.append(("peak RSS (MB)", base["peak_rss_mb"], result["peak_rss_mb"]))
+        for stage, before, after in rows:
+            ratio = after / before if before else float("inf")
+            flag = ""
+            if ratio > tolerance and (stage == "peak RSS (MB)" or before >= MIN_COMPARED_SECONDS):
+                flag = "  <- slower" if stage != "peak RSS (MB)" else "  <- larger"
+                regressions.append((scale, stage, ratio))
+            print(f"{scale + 'x':>6}  {stage:<40} {before:>10.3f} {after:>10.3f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated multiples of the UCI row counts (1000 needs ~10 GB of RAM)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-fit-rows", type=int, default=200_000,
+                        help="rows sampled for the model fits (0 = all)")
+    parser.add_argument("--skip-models", action="store_true")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="also store this report as the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--child", metavar="WORKDIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_stages(args.child, args.max_fit_rows, not args.skip_models)))
+        return
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(),
+              "max_fit_rows": args.max_fit_rows, "results": {}}
+    for scale in (int(s) for s in args.scales.split(",")):
+        result = run_scale(scale, args)
+        report["results"][str(scale)] = result
+        total = sum(t["wall_s"] for t in result["stages"].values())
+        print(f"{scale:>5}x  {result['rows']['hour']:>11,} hour rows  {total:8.2f} s  "
+              f"peak RSS {result['peak_rss_mb']:8.1f} MB")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"report: {args.output}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.2f}x")
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline: {args.baseline}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Pre-aggregated cube behind the group-by charts.
+
+A cube holds, for every combination of the dimension codes that occurs in
+the data, the sum of each measure and the number of rows (`n`). Any mean the
+charts need is then a roll-up of the cube: sum the measures and counts over
+the dimensions you keep and divide. Chart preparation scales with the number
+of cells, which is bounded by the dimension cardinalities, not by the row
+count. Cubes built from separate chunks or partitions combine with
+`merge_cubes`.
+"""
+import numpy as np
+import pandas as pd
+
+import enrich
+
+HOUR_DIMS = ["yr", "mnth", "season", "hr", "weekday", "holiday", "workingday", "weathersit"]
+DAY_DIMS = ["yr", "mnth", "season", "weekday", "holiday", "workingday", "weathersit"]
+MEASURES = ["cnt", "casual", "registered"]
+
+# Label dimensions that can be derived from the stored code dimensions
+DERIVED = {
+    "season_name": lambda c: enrich.code_labels(c["season"], enrich.SEASON_NAMES, offset=1),
+    "weekday_name": lambda c: enrich.code_labels(c["weekday"], enrich.WEEKDAY_NAMES),
+    "month_name": lambda c: enrich.code_labels(c["mnth"], enrich.MONTH_NAMES, offset=1),
+    "weathersit_name": lambda c: enrich.code_labels(c["weathersit"], enrich.WEATHER_NAMES, offset=1),
+    "day_type": lambda c: enrich.code_labels(enrich.day_type_codes(c["holiday"], c["weekday"]), enrich.DAY_TYPES),
+}
+
+
+def _compact(cube, dims):
+    return cube.astype({**{d: "int8" for d in dims}, "n": "int64"})
+
+
+def build_cube(df, dims, measures=MEASURES):
+    grouped = df.groupby(dims, observed=True, sort=True)
+    cube = grouped[measures].sum().astype("int64")
+    cube["n"] = grouped.size()
+    return _compact(cube.reset_index(), dims)
+
+
+def merge_cubes(cubes, dims):
+    cubes = [c for c in cubes if len(c)]
+    if not cubes:
+        return None
+    if len(cubes) == 1:
+        return cubes[0]
+    merged = pd.concat(cubes, ignore_index=True).groupby(dims, sort=True).sum().reset_index()
+    return _compact(merged, dims)
+
+
+def rollup(cube, by, measures=MEASURES, where=None):
+    """Mean of each measure per group of `by`, optionally restricted by `where`.
+
+    `by` may name stored dimensions or any label in DERIVED. `where` maps a
+    stored dimension to a value or a list of allowed values.
+    """
+    if where:
+        mask = np.ones(len(cube), dtype=bool)
+        for dim, allowed in where.items():
+            mask &= cube[dim].isin(np.atleast_1d(allowed)).to_numpy()
+        cube = cube[mask]
+    extra = {name: DERIVED[name](cube) for name in by if name in DERIVED}
+    if extra:
+        cube = cube.assign(**extra)
+    totals = cube.groupby(by, observed=True, sort=True)[measures + ["n"]].sum()
+    return totals[measures].div(totals["n"], axis=0).reset_index()
@@ -0,0 +1,192 @@
+"""Columnar cache for day.csv and hour.csv.
+
+The first load parses each CSV once and writes it as an uncompressed Feather
+(Arrow IPC) file with compact dtypes. Later loads memory-map that file instead
+of re-parsing the CSV. A small sidecar records the size, mtime and SHA-256 of
+the source CSV; the Feather file is rebuilt whenever the CSV's contents change.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+CACHE_DIR = os.environ.get("BIKE_DATA_CACHE", os.path.join(".cache", "data"))
+# Bump when DTYPES or the cached layout changes
+CACHE_VERSION = 1
+# Rows per chunk when a CSV is streamed instead of loaded whole
+CHUNK_ROWS = int(os.environ.get("BIKE_CHUNK_ROWS", 250_000))
+
+DTYPES = {
+    "instant": "int32",
+    "season": "int8", "yr": "int8", "mnth": "int8", "hr": "int8",
+    "holiday": "int8", "weekday": "int8", "workingday": "int8", "weathersit": "int8",
+    "temp": "float32", "atemp": "float32", "hum": "float32", "windspeed": "float32",
+    "casual": "int32", "registered": "int32", "cnt": "int32",
+}
+
+_digests = {}
+# One lock per cache file, so concurrent cold loads build it once
+_build_locks = {}
+_locks_lock = threading.Lock()
+
+
+def file_digest(path):
+    # Hashing a CSV on every rerun would defeat the point, so remember the
+    # digest until the file's size or mtime changes.
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _digests.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    _digests[path] = (stamp, digest)
+    return digest
+
+
+def _tmp_path(path):
+    # Sessions are threads of one process, so the pid alone is not unique
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _build_lock(path):
+    with _locks_lock:
+        return _build_locks.setdefault(path, threading.Lock())
+
+
+def _paths(csv_path):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    base = os.path.join(CACHE_DIR, stem)
+    return f"{base}.feather", f"{base}.meta.json"
+
+
+def _parse_dates(df):
+    if "dteday" in df.columns:
+        df["dteday"] = pd.to_datetime(df["dteday"])
+    return df
+
+
+def read_csv(csv_path):
+    # CSV columns not listed in DTYPES keep pandas' inferred dtype
+    return _parse_dates(pd.read_csv(csv_path, dtype=DTYPES))
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp = _tmp_path(meta_path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+
+def _is_fresh(csv_path, feather_path, meta_path):
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("version") != CACHE_VERSION or not os.path.exists(feather_path):
+        return False
+    stat = os.stat(csv_path)
+    if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    # Touched but possibly unchanged (e.g. a fresh checkout): compare contents
+    if meta["sha256"] != file_digest(csv_path):
+        return False
+    meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    _write_meta(meta_path, meta)
+    return True
+
+
+def build(csv_path):
+    """Convert `csv_path` to its Feather cache unconditionally."""
+    feather_path, meta_path = _paths(csv_path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df = read_csv(csv_path)
+    tmp = _tmp_path(feather_path)
+    # Uncompressed so the file can be memory-mapped without decoding
+    feather.write_feather(df, tmp, compression="uncompressed")
+    os.replace(tmp, feather_path)
+    _record_source(csv_path, meta_path, len(df))
+    return feather_path
+
+
+def _record_source(csv_path, meta_path, rows):
+    stat = os.stat(csv_path)
+    _write_meta(meta_path, {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(csv_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(csv_path),
+        "rows": rows,
+    })
+
+
+def load_table(csv_path):
+    """Return `csv_path` as a DataFrame backed by its memory-mapped Feather cache."""
+    feather_path, meta_path = _paths(csv_path)
+    if not _is_fresh(csv_path, feather_path, meta_path):
+        with _build_lock(feather_path):
+            # Another thread may have built it while we waited
+            if not _is_fresh(csv_path, feather_path, meta_path):
+                build(csv_path)
+    table = feather.read_table(feather_path, memory_map=True)
+    # split_blocks keeps one block per column so numeric columns stay zero-copy
+    # views of the mapped file instead of being consolidated into new arrays
+    return table.to_pandas(split_blocks=True)
+
+
+def load_frames(day_path="day.csv", hour_path="hour.csv"):
+    return load_table(day_path), load_table(hour_path)
+
+
+def iter_chunks(csv_path, chunk_rows=CHUNK_ROWS):
+    """Yield `csv_path` as DataFrames of bounded size, never holding the whole file.
+
+    A fresh Feather cache is read record batch by record batch from the memory
+    map. Otherwise the CSV is parsed `chunk_rows` at a time and each chunk is
+    also appended to a new Feather cache, so the next pass is memory-mapped.
+    """
+    feather_path, meta_path = _paths(csv_path)
+    if _is_fresh(csv_path, feather_path, meta_path):
+        with pa.memory_map(feather_path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pandas()
+        return
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = _tmp_path(feather_path)
+    writer = None
+    rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, dtype=DTYPES, chunksize=chunk_rows):
+            chunk = _parse_dates(chunk)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(tmp, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+            yield chunk
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.replace(tmp, feather_path)
+            _record_source(csv_path, meta_path, rows)
+    finally:
+        # Abandoned or failed passes leave no partial cache behind
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
@@ -0,0 +1,141 @@
+"""Server-side thinning for large scatter plots.
+
+Below `SCATTER_THRESHOLD` rows a scatter is drawn as-is. Above it the
+figure is drawn from either
+
+* a stratified sample: the x/y plane is cut into a grid with no more cells
+  than the point budget, every non-empty cell keeps at least one point and
+  the rest of the budget is shared out in proportion to cell counts, so
+  dense regions stay dense, sparse ones stay visible and the budget holds; or
+* a density heatmap of 2D bin counts.
+
+Both modes keep the outliers (points outside the 1.5 x IQR whiskers on
+either axis), so extreme observations never disappear.
+"""
+import math
+import os
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+SCATTER_THRESHOLD = int(os.environ.get("BIKE_SCATTER_THRESHOLD", 5000))
+POINT_BUDGET = int(os.environ.get("BIKE_POINT_BUDGET", 2000))
+GRID_BINS = 40
+MODES = ["auto", "sample", "density", "full"]
+
+
+def outlier_mask(x, y):
+    mask = np.zeros(len(x), dtype=bool)
+    for values in (x, y):
+        q1, q3 = np.percentile(values, [25, 75])
+        spread = 1.5 * (q3 - q1)
+        mask |= (values < q1 - spread) | (values > q3 + spread)
+    return mask
+
+
+def _cells(x, y, bins):
+    def bin_index(values):
+        lo, hi = values.min(), values.max()
+        scaled = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+        return np.minimum((scaled * bins).astype(np.int64), bins - 1)
+    return bin_index(x) * bins + bin_index(y)
+
+
+def stratified_sample(x, y, budget=POINT_BUDGET, bins=GRID_BINS, keep_outliers=True, seed=42):
+    """Return sorted row positions of at most `budget` points, outliers included.
+
+    The grid is coarsened below `bins` when the budget cannot give every cell a point.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= budget:
+        return np.arange(n)
+    keep = outlier_mask(x, y) if keep_outliers else np.zeros(n, dtype=bool)
+    # Outliers are capped at a quarter of the budget so they cannot crowd out the body
+    outliers = np.flatnonzero(keep)
+    if len(outliers) > budget // 4:
+        rng = np.random.default_rng(seed)
+        keep[:] = False
+        keep[rng.choice(outliers, budget // 4, replace=False)] = True
+    remaining = int(budget - keep.sum())
+    if remaining <= 0:
+        return np.flatnonzero(keep)
+
+    # The budget left is shared among the points not already kept
+    body = np.flatnonzero(~keep)
+    bins = max(1, min(bins, math.isqrt(remaining)))
+    cells = _cells(x, y, bins)[body]
+    counts = np.bincount(cells, minlength=bins * bins)
+    # One point per non-empty cell, the rest by largest remainder so the quotas sum to `remaining`
+    quota = (counts > 0).astype(np.int64)
+    share = counts * (remaining - quota.sum()) / len(body)
+    quota += np.floor(share).astype(np.int64)
+    leftover = remaining - quota.sum()
+    quota[np.argsort(np.floor(share) - share, kind="stable")[:leftover]] += 1
+    # Rank points inside their cell in random order; keep the first `quota`
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(body)), cells))
+    sorted_cells = cells[order]
+    starts = np.searchsorted(sorted_cells, sorted_cells, side="left")
+    rank = np.arange(len(body)) - starts
+    keep[body[order[rank < quota[sorted_cells]]]] = True
+    return np.flatnonzero(keep)
+
+
+def density_grid(x, y, bins=GRID_BINS):
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return counts, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def _payload_bytes(df, columns):
+    return len(to_json_plotly({c: df[c].to_numpy() for c in columns}))
+
+
+def scatter(df, x, y, mode="auto", threshold=SCATTER_THRESHOLD, budget=POINT_BUDGET,
+            dense_mode="sample", **px_kwargs):
+    """px.scatter that thins large inputs; returns (figure, info dict)."""
+    n = len(df)
+    if mode == "auto":
+        mode = dense_mode if n > threshold else "full"
+    columns = [c for c in dict.fromkeys([x, y, px_kwargs.get("color")]) if c in df.columns]
+    info = {"rows": n, "mode": mode, "shown": n}
+    if mode == "full":
+        return px.scatter(df, x=x, y=y, **px_kwargs), info
+
+    xs = df[x].to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    if mode == "sample":
+        rows = stratified_sample(xs, ys, budget)
+        embedded = df.iloc[rows]
+        fig = px.scatter(embedded, x=x, y=y, **px_kwargs)
+        info["shown"] = len(rows)
+    else:
+        embedded = df.iloc[:0]
+        counts, x_mid, y_mid = density_grid(xs, ys)
+        labels = px_kwargs.get("labels", {})
+        fig = go.Figure(go.Heatmap(
+            x=x_mid, y=y_mid, z=counts.T,
+            colorscale=px_kwargs.get("color_continuous_scale", "Viridis"),
+            colorbar=dict(title="Count"),
+            hovertemplate=f"{labels.get(x, x)}: %{{x:.2f}}<br>{labels.get(y, y)}: %{{y:.0f}}<br>Count: %{{z}}<extra></extra>"))
+        outliers = np.flatnonzero(outlier_mask(xs, ys))
+        fig.add_trace(go.Scatter(x=xs[outliers], y=ys[outliers], mode="markers", name="Outliers",
+                                 marker=dict(size=4, color="white", opacity=0.6)))
+        fig.update_layout(title=px_kwargs.get("title"), xaxis_title=labels.get(x, x),
+                          yaxis_title=labels.get(y, y), template=px_kwargs.get("template"))
+        info["shown"] = int((counts > 0).sum()) + len(outliers)
+    info["bytes"] = len(fig.to_json())
+    # Estimate the unthinned figure by swapping the embedded rows for all rows
+    info["full_bytes"] = info["bytes"] - _payload_bytes(embedded, columns) + _payload_bytes(df, columns)
+    return fig, info
+
+
+def describe(info):
+    if info["mode"] == "full":
+        return None
+    what = "stratified sample, outliers kept" if info["mode"] == "sample" else "density bins + outliers"
+    return (f"Showing {info['shown']:,} marks for {info['rows']:,} rows ({what}): "
+            f"{info['bytes'] / 1024:,.0f} KB instead of ~{info['full_bytes'] / 1024:,.0f} KB of figure JSON.")
@@ -0,0 +1,46 @@
+"""Derived columns for the day and hour frames, computed in one vectorized pass.
+
+Every label column is a pandas Categorical built straight from the integer
+codes with `Categorical.from_codes`, so no per-row Python runs and the
+category order (Sunday..Saturday, January..December, ...) travels with the
+data. The numeric code columns are left untouched, and the input frame is
+never modified: a new frame is returned.
+"""
+import numpy as np
+import pandas as pd
+
+SEASON_NAMES = ["Winter", "Spring", "Summer", "Fall"]
+WEEKDAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+WEATHER_NAMES = ["Clear", "Misty", "Light Rain/Snow", "Heavy Rain/Snow"]
+DAY_TYPES = ["Workday", "Weekend", "Holiday"]
+
+
+def code_labels(codes, names, offset=0):
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int64) - offset,
+                                     categories=names, ordered=True)
+
+
+def day_type_codes(holiday, weekday):
+    # Holidays win over weekends, matching how the story describes day types
+    holiday = np.asarray(holiday)
+    weekday = np.asarray(weekday)
+    return np.select([holiday == 1, (weekday == 0) | (weekday == 6)], [2, 1], default=0)
+
+
+def enrich_day(day_df):
+    return day_df.assign(
+        season_name=code_labels(day_df["season"], SEASON_NAMES, offset=1),
+        weekday_name=code_labels(day_df["weekday"], WEEKDAY_NAMES),
+    )
+
+
+def enrich_hour(hour_df):
+    return hour_df.assign(
+        season_name=code_labels(hour_df["season"], SEASON_NAMES, offset=1),
+        weekday_name=code_labels(hour_df["weekday"], WEEKDAY_NAMES),
+        month_name=code_labels(hour_df["mnth"], MONTH_NAMES, offset=1),
+        weathersit_name=code_labels(hour_df["weathersit"], WEATHER_NAMES, offset=1),
+        day_type=code_labels(day_type_codes(hour_df["holiday"], hour_df["weekday"]), DAY_TYPES),
+    )
@@ -0,0 +1,135 @@
+"""Cross-validated evaluation of the Part 4 models.
+
+Every model is scored on `folds` splits of the encoded hourly rows, either
+shuffled k-fold or scikit-learn's TimeSeriesSplit (train on the past, test on
+the block that follows). The (model, fold) fits are fanned out with
+training.run_in_pool, slowest models first. Each finished fold is appended
+to an on-disk log keyed like the model store (estimator, parameters,
+columns, rows, data) plus the scheme, fold count and fold number, so reruns
+and interrupted runs only fit the folds that are missing.
+
+A model's summary is the mean MSE and R² over its folds with the half-width
+of a Student-t confidence interval, and the mean fit and predict seconds per
+fold. Folds share training rows, so the interval is a guide to the spread,
+not an exact coverage guarantee.
+"""
+import os
+import time
+
+import numpy as np
+from scipy import stats
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold, TimeSeriesSplit
+
+import model_store
+import training
+
+FOLD_LOG = os.environ.get("BIKE_FOLD_LOG", os.path.join(".cache", "evaluation", "folds.jsonl"))
+CV_FOLDS = int(os.environ.get("BIKE_CV_FOLDS", 5))
+CONFIDENCE = 0.95
+SCHEMES = ["k-fold", "time series"]
+
+
+def splitter(scheme, folds):
+    if scheme == "time series":
+        return TimeSeriesSplit(n_splits=folds)
+    if scheme == "k-fold":
+        return KFold(n_splits=folds, shuffle=True, random_state=42)
+    raise ValueError(f"unknown CV scheme {scheme!r}; expected one of {SCHEMES}")
+
+
+def fold_context(name, model, X, scheme, folds, data_digest):
+    rows = model_store.rows_digest(X)[:24]
+    return model_store.model_key(name, model, model_store.column_signature(X), f"{scheme}:{folds}:{rows}",
+                                 data_digest)
+
+
+def read_folds(log_path=FOLD_LOG):
+    """Return {(context, fold): record} for every logged fold."""
+    return model_store.read_log(log_path, lambda record: (record["context"], record["fold"]))
+
+
+def _fold_job(model, X, y, train_rows, test_rows):
+    model = clone(model)
+    start = time.perf_counter()
+    model.fit(X.iloc[train_rows], y.iloc[train_rows])
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X.iloc[test_rows])
+    predict_seconds = time.perf_counter() - start
+    y_test = y.iloc[test_rows]
+    return {"MSE": float(mean_squared_error(y_test, y_pred)), "R²": float(r2_score(y_test, y_pred)),
+            "fit_s": fit_seconds, "predict_s": predict_seconds, "test_rows": len(test_rows)}
+
+
+def _half_width(values, confidence):
+    if len(values) < 2:
+        return float("nan")
+    return float(stats.t.ppf((1 + confidence) / 2, len(values) - 1) * np.std(values, ddof=1) / np.sqrt(len(values)))
+
+
+def summarize(records, confidence=CONFIDENCE):
+    """Mean ± CI half-width of MSE and R², and mean fit/predict seconds, over fold records."""
+    summary = {"Folds": len(records)}
+    for metric in ("MSE", "R²"):
+        values = np.array([r[metric] for r in records])
+        summary[metric] = float(values.mean())
+        summary[f"{metric} ± CI"] = _half_width(values, confidence)
+    summary["Fit (s)"] = float(np.mean([r["fit_s"] for r in records]))
+    summary["Predict (s)"] = float(np.mean([r["predict_s"] for r in records]))
+    return summary
+
+
+def _error(message):
+    return {"Folds": 0, "MSE": "Error", "R²": message}
+
+
+def evaluate_models(models, X, y, data_digest, scheme="k-fold", folds=CV_FOLDS,
+                    max_workers=None, timeout=None, log_path=FOLD_LOG, on_result=None):
+    """Cross-validate every model, calling `on_result(name, summary)` once all its folds are in.
+
+    Returns {name: summary} in the order of `models`.
+    """
+    max_workers = max_workers or training.TRAIN_WORKERS
+    timeout = timeout or training.MODEL_TIMEOUT
+    splits = list(splitter(scheme, folds).split(X))
+    logged = read_folds(log_path)
+    results, fold_records, contexts = {}, {}, {}
+
+    def publish(name, summary):
+        results[name] = summary
+        if on_result is not None:
+            on_result(name, summary)
+
+    def record_fold(name, fold, record):
+        record = {"context": contexts[name], "model": name, "fold": fold, **record}
+        model_store.append_log(log_path, record)
+        fold_records[name][fold] = record
+        if len(fold_records[name]) == len(splits):
+            publish(name, summarize([fold_records[name][i] for i in range(len(splits))]))
+
+    # Logged folds count straight away; only the missing ones are fitted
+    todo = []
+    for name, model in models.items():
+        contexts[name] = fold_context(name, model, X, scheme, folds, data_digest)
+        fold_records[name] = {i: logged[(contexts[name], i)] for i in range(len(splits))
+                              if (contexts[name], i) in logged}
+        if len(fold_records[name]) == len(splits):
+            publish(name, summarize([fold_records[name][i] for i in range(len(splits))]))
+        todo.extend((name, model, i) for i in range(len(splits)) if i not in fold_records[name])
+
+    workers = max(1, min(max_workers, len(todo)))
+    thread_env = training.share_cores({id(model): model for _, model, _ in todo}.values(), workers)
+    todo.sort(key=lambda job: training.fit_cost(job[1]), reverse=True)
+    tasks = [((name, fold), _fold_job, (model, X, y, *splits[fold])) for name, model, fold in todo]
+    for (name, fold), record, error in training.run_in_pool(tasks, timeout, workers, thread_env):
+        if name in results:
+            continue  # an earlier fold of this model failed
+        if isinstance(error, TimeoutError):
+            publish(name, _error(f"Fold {fold + 1} timed out after {timeout:.0f}s"))
+        elif error is not None:
+            publish(name, _error(str(error)))
+        else:
+            record_fold(name, fold, record)
+    return {name: results[name] for name in models if name in results}
@@ -0,0 +1,131 @@
+"""Frozen feature encoding shared by Part 4 training, its charts and predict.py.
+
+`fit_encoder` learns the category vocabularies of the model features and the
+output column layout, which is the one pd.get_dummies(X, drop_first=True)
+gives for these features: the numeric columns in order, then one 0/1 column
+per category of weekday and weathersit except the first. The encoder is a
+plain dict, saved as JSON next to the models. `transform` writes any frame
+with the raw features into a float32 NumPy matrix (or a CSR matrix) in that
+layout, so training and scoring always agree on the columns, whatever
+categories the scored rows contain.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import enrich
+
+MODEL_FEATURES = ['temp', 'hum', 'windspeed', 'hr', 'weekday', 'weathersit', 'holiday']
+CATEGORICAL = ['weekday', 'weathersit']
+# Features that hold whole-number codes (weekday may also be a name)
+INTEGER = ['hr', 'weathersit', 'holiday']
+ENCODER_PATH = os.environ.get("BIKE_FEATURE_ENCODER", os.path.join(".cache", "models", "features.json"))
+
+
+def _labels(df, column):
+    """String categories of `column`; weekdays may be codes, names or a mix."""
+    values = df[column]
+    codes = pd.to_numeric(values, errors="coerce")
+    if column == "weekday":
+        is_code = codes.isin(range(len(enrich.WEEKDAY_NAMES)))
+        return values.astype(str).mask(is_code, codes[is_code].astype(int).map(dict(enumerate(enrich.WEEKDAY_NAMES))))
+    # weathersit codes become "1".."4", as astype(str) did before one-hot encoding
+    return codes.astype("Int64").astype(str)
+
+
+def _check_columns(df, columns):
+    # Bad input is a ValueError naming the column, not a KeyError or TypeError from deep inside
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing feature columns: {missing}")
+    for column in columns:
+        if column == "weekday":
+            continue
+        values = df[column]
+        numbers = pd.to_numeric(values, errors="coerce")
+        bad = values.notna() & (numbers.isna() | ((numbers % 1 != 0) if column in INTEGER else False))
+        if bad.any():
+            kind = "whole numbers" if column in INTEGER else "numbers"
+            raise ValueError(f"{column} must hold {kind}, got {sorted(set(values[bad].astype(str)))[:5]}")
+
+
+def fit_encoder(df):
+    _check_columns(df, MODEL_FEATURES)
+    numeric = [f for f in MODEL_FEATURES if f not in CATEGORICAL]
+    vocabularies = {
+        # Every weekday, as the ordered weekday_name categorical gave get_dummies
+        "weekday": list(enrich.WEEKDAY_NAMES),
+        "weathersit": sorted(_labels(df, "weathersit").unique()),
+    }
+    columns = numeric + [f"{c}_{v}" for c in CATEGORICAL for v in vocabularies[c][1:]]
+    return {"numeric": numeric, "categorical": vocabularies, "columns": columns}
+
+
+def _category_codes(encoder, df):
+    for column, vocabulary in encoder["categorical"].items():
+        # Labels are resolved once per distinct value, then broadcast to the rows
+        row_codes, uniques = pd.factorize(df[column])
+        labels = _labels(pd.DataFrame({column: uniques}), column)
+        positions = pd.Categorical(labels, categories=vocabulary).codes
+        if (positions < 0).any():
+            unknown = sorted(uniques[positions < 0].tolist(), key=str)
+            raise ValueError(f"{column} has categories the encoder was not fitted on: {unknown}")
+        if (row_codes < 0).any():
+            raise ValueError(f"{column} has missing values")
+        yield positions[row_codes]
+
+
+def transform(encoder, df, sparse=False):
+    """Encode `df` into a float32 matrix with `encoder["columns"]`; CSR when `sparse`."""
+    _check_columns(df, encoder["numeric"] + list(encoder["categorical"]))
+    n, numeric = len(df), len(encoder["numeric"])
+    category_codes = list(_category_codes(encoder, df))
+    if sparse:
+        from scipy import sparse as sp
+        rows = [np.repeat(np.arange(n), numeric)]
+        cols = [np.tile(np.arange(numeric), n)]
+        data = [df[encoder["numeric"]].to_numpy(dtype=np.float32).ravel()]
+    else:
+        X = np.zeros((n, len(encoder["columns"])), dtype=np.float32)
+        for i, column in enumerate(encoder["numeric"]):
+            X[:, i] = df[column].to_numpy(dtype=np.float32)
+    offset = numeric
+    for codes, vocabulary in zip(category_codes, encoder["categorical"].values()):
+        # The first category is dropped: its rows stay all zero
+        hot = np.flatnonzero(codes > 0)
+        if sparse:
+            rows.append(hot)
+            cols.append(offset + codes[hot] - 1)
+            data.append(np.ones(len(hot), dtype=np.float32))
+        else:
+            X[hot, offset + codes[hot] - 1] = 1
+        offset += len(vocabulary) - 1
+    if sparse:
+        return sp.csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n, len(encoder["columns"])))
+    return X
+
+
+def frame(encoder, X, index=None):
+    # Zero-copy column labels for estimators and charts that want feature names
+    return pd.DataFrame(X, columns=encoder["columns"], index=index, copy=False)
+
+
+def save_encoder(encoder, path=ENCODER_PATH):
+    if load_encoder(path) == encoder:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(encoder, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_encoder(path=ENCODER_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,72 @@
+"""Process-wide LRU cache of serialized Plotly figures.
+
+Figures are stored as their JSON, keyed by the builder's name, a fingerprint
+of the data it was built from and the chart parameters. Every session reuses
+the same JSON instead of re-running the `px.*`/`go.*` construction and
+validation. The cache holds at most `FIGURE_CACHE_MB` of JSON and evicts the
+least recently used figures beyond that.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+FIGURE_CACHE_MB = float(os.environ.get("BIKE_FIGURE_CACHE_MB", 64))
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+
+def _key(builder, fingerprint, params):
+    return (f"{builder.__module__}.{builder.__qualname__}", fingerprint,
+            json.dumps(params, sort_keys=True, default=repr))
+
+
+def get(builder, fingerprint, *data, **params):
+    """Return `builder(*data, **params)`, rebuilt only on a cache miss.
+
+    `fingerprint` must change whenever `data` does; `params` are part of the key.
+    """
+    key = _key(builder, fingerprint, params)
+    with _lock:
+        blob = _entries.get(key)
+        if blob is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+    if blob is None:
+        blob = builder(*data, **params).to_json()
+        _store(key, blob)
+    return pio.from_json(blob)
+
+
+def _store(key, blob):
+    limit = FIGURE_CACHE_MB * 1024 * 1024
+    with _lock:
+        _stats["misses"] += 1
+        if len(blob) > limit:
+            return
+        previous = _entries.pop(key, None)
+        if previous is not None:
+            _stats["bytes"] -= len(previous)
+        _entries[key] = blob
+        _stats["bytes"] += len(blob)
+        while _stats["bytes"] > limit:
+            _, evicted = _entries.popitem(last=False)
+            _stats["bytes"] -= len(evicted)
+            _stats["evictions"] += 1
+
+
+def stats():
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {**_stats, "entries": len(_entries),
+                "hit_rate": _stats["hits"] / lookups if lookups else 0.0}
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, evictions=0, bytes=0)
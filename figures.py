@@ -0,0 +1,296 @@
+"""Pure builders for every chart in the data story.
+
+Each function takes the data it draws (frames, cubes or small tables) plus
+chart parameters and returns a new Plotly figure. None of them reads global
+state or touches Streamlit, so their output only depends on their inputs and
+can be cached by figure_cache.
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import cube
+import downsample
+import enrich
+import heatmap
+
+CASUAL_COLOR = "#1E90FF"
+REGISTERED_COLOR = "#FF6347"
+
+# Shared styling of the larger charts
+_LARGE_FONTS = dict(font=dict(size=14), title_font=dict(size=20),
+                    xaxis_title_font=dict(size=16), yaxis_title_font=dict(size=16))
+_MARGIN = dict(t=60, b=60, l=50, r=50)
+
+
+def downsample_info(fig):
+    meta = fig.layout.meta
+    return meta.get("downsample") if isinstance(meta, dict) else None
+
+
+def _thinned_scatter(df, x, y, mode, budget, **px_kwargs):
+    fig, info = downsample.scatter(df, x=x, y=y, mode=mode, budget=budget, **px_kwargs)
+    # Keep the thinning summary with the figure so it survives the figure cache
+    fig.update_layout(meta={"downsample": info})
+    return fig
+
+
+# VISUALIZATION 1: Bike Usage Across Different Seasons
+def season_box(day_df):
+    return px.box(day_df, x='season_name', y='cnt', color='season_name',
+                  title="Bike Usage Across Different Seasons",
+                  labels={'cnt': 'Total Bike Rentals', 'season_name': 'Season'})
+
+
+# VISUALIZATION 2: Long-term Trends in Bike Usage
+def trend(day_df):
+    return px.line(day_df, x='dteday', y='cnt', title="Long-term Trends in Bike Usage Over the Years",
+                   labels={'dteday': 'Date', 'cnt': 'Total Bike Rentals'}, markers=True)
+
+
+# VISUALIZATION 3: Hourly Bike Demand Across Days of the Week
+def hourly_animated(hour_cube):
+    hourly_trends = cube.rollup(hour_cube, ["hr", "weekday_name"], ["cnt"])
+    return px.bar(hourly_trends, x="hr", y="cnt", animation_frame="weekday_name",
+                  title="Hourly Bike Demand Across Days of the Week",
+                  labels={"cnt": "Average Rentals", "hr": "Hour of Day", "weekday_name": "Day of the Week"},
+                  color="cnt", color_continuous_scale="viridis",
+                  category_orders={"weekday_name": enrich.WEEKDAY_NAMES})  # Explicitly enforce order
+
+
+# VISUALIZATION 4: Bike Usage Trends Over the Week
+def weekly_trends_line(day_cube):
+    # weekday_name is an ordered categorical, so the days sort properly
+    weekly_trends = cube.rollup(day_cube, ["weekday_name"], ["cnt"])
+    fig = px.line(
+        weekly_trends,
+        x="weekday_name",
+        y="cnt",
+        text=weekly_trends["cnt"].round(2),
+        title="Bike Usage Trends Over the Week",
+        labels={"cnt": "Average Bike Rentals", "weekday_name": "Day of the Week"},
+        markers=True,
+        template="plotly_dark")
+    fig.update_traces(line=dict(width=3), textposition="top center")
+    fig.update_layout(width=800)
+    return fig
+
+
+# VISUALIZATION 5: Distribution of Bike Rentals Across the Week
+def weekly_trends_box(day_df):
+    return px.box(
+        day_df, x="weekday_name", y="cnt",
+        title="Distribution of Bike Rentals Across the Week",
+        labels={"cnt": "Total Bike Rentals", "weekday_name": "Day of the Week"},
+        color="weekday_name",
+        category_orders={"weekday_name": enrich.WEEKDAY_NAMES})  # **Explicitly enforce order**
+
+
+# VISUALIZATION 6: Holiday and Workday Trends in Ridership
+def hourly_rentals(hour_cube):
+    hourly_avg = cube.rollup(hour_cube, ["hr", "day_type"], ["cnt"])
+    fig = px.line(
+        hourly_avg,
+        x="hr",
+        y="cnt",
+        color="day_type",
+        title="Hourly Bike Rental Trends",
+        labels={"hr": "Hour of the Day", "cnt": "Average Rentals", "day_type": "Day Type"},
+        template="plotly_dark",
+        markers=True,
+        width=1000)
+    fig.update_traces(line=dict(width=3))
+    fig.update_layout(legend_title_text="Day Type")
+    return fig
+
+
+# VISUALIZATION 7: Hourly Bike Rental Trends Across Months
+def facet_interactive(hour_cube):
+    hourly_monthly_rentals = cube.rollup(hour_cube, ["month_name", "hr"], ["cnt"])
+    fig = px.line(
+        hourly_monthly_rentals, x="hr", y="cnt", color="month_name",
+        title="Hourly Bike Rental Trends Across Months",
+        labels={"cnt": "Avg Rentals", "hr": "Hour of the Day", "month_name": "Month"},
+        template="plotly_dark",
+        facet_col="month_name",
+        facet_col_wrap=4,  # Display facets in a grid format
+        line_group="month_name",
+        markers=True)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig.update_layout(font=dict(size=12), showlegend=False, height=700, width=1000)
+    return fig
+
+
+# VISUALIZATION 8: Impact of Temperature on Bike Rentals
+def temp_scatter(day_df, mode="auto", budget=downsample.POINT_BUDGET):
+    return _thinned_scatter(day_df, 'temp', 'cnt', mode, budget,
+                            title="Impact of Temperature on Bike Rentals",
+                            labels={'temp': 'Temperature (Normalized)', 'cnt': 'Total Bike Rentals'},
+                            color='cnt', color_continuous_scale='turbo')
+
+
+# VISUALIZATION 9: Impact of Humidity on Bike Rentals
+def humidity_scatter(day_df, mode="auto", budget=downsample.POINT_BUDGET):
+    return _thinned_scatter(day_df, 'hum', 'cnt', mode, budget,
+                            title="Impact of Humidity on Bike Rentals",
+                            labels={'hum': 'Humidity (Normalized)', 'cnt': 'Total Bike Rentals'},
+                            color='cnt', color_continuous_scale='magma')
+
+
+# VISUALIZATION 10: Are bike rentals more affected by temperature or humidity?
+WEATHER_AXES = {"temp": ("Temperature", "Temperature (°C)"),
+                "atemp": ("Feels-like Temperature", "Feels-like Temperature (°C)"),
+                "hum": ("Humidity", "Humidity (%)"),
+                "windspeed": ("Wind Speed", "Wind Speed (Normalized)")}
+
+
+def weather_heatmap(grid, x="temp", y="hum", bins=heatmap.DEFAULT_BINS):
+    # Mean rentals per bin, summed up from the cached fine grid; rows are
+    # the x column (temperature), columns the y column (humidity). The pair
+    # is passed again as parameters so it is part of the figure cache key.
+    if (grid["x"], grid["y"]) != (x, y):
+        raise ValueError(f"grid is {grid['x']} x {grid['y']}, not {x} x {y}")
+    heatmap_data = heatmap.coarsen(grid, bins)
+    row_name, row_title = WEATHER_AXES[x]
+    column_name, column_title = WEATHER_AXES[y]
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=heatmap_data.values,
+            x=heatmap_data.columns,
+            y=heatmap_data.index,
+            colorscale='Viridis',
+            colorbar=dict(title="Avg Bike Rentals")))
+    fig.update_layout(
+        title=f'Effect of {row_name} and {column_name} on Bike Rentals',
+        xaxis_title=column_title,
+        yaxis_title=row_title,
+        template='plotly_dark',
+        width=1000,
+        height=600,
+        **_LARGE_FONTS)
+    return fig
+
+
+# VISUALIZATION 11: What are the effects of wind speed on bike usage?
+def wind_scatter(hour_df, mode="auto", budget=downsample.POINT_BUDGET):
+    fig = _thinned_scatter(
+        hour_df, 'windspeed', 'cnt', mode, budget,
+        title='Effect of Wind Speed on Bike Rentals',
+        labels={'windspeed': 'Wind Speed (Normalized)', 'cnt': 'Total Bike Rentals'},
+        opacity=0.5,
+        color='cnt',
+        color_continuous_scale='Viridis',
+        template='plotly_dark')
+    fig.update_layout(template="plotly_dark", width=900, height=550, **_LARGE_FONTS)
+    return fig
+
+
+# VISUALIZATION 12: How does different weather conditions (e.g., clear, misty, rainy) affect ridership?
+def weather_box(hour_df):
+    fig = px.box(
+        hour_df, x='weathersit_name', y='cnt', color='weathersit_name',
+        title='Bike Rentals by Weather Condition',
+        labels={'weathersit_name': 'Weather Condition', 'cnt': 'Total Bike Rentals'},
+        color_discrete_sequence=['#E63946', '#F4A261', '#2A9D8F', '#E9C46A'],
+        points=False)
+    fig.update_layout(template="plotly_dark", width=900, height=550, **_LARGE_FONTS)
+    fig.update_traces(
+        hovertemplate="Weather Condition: %{x}<br>Min: %{y|.2f}<br>Median: %{median|.2f}<br>Max: %{upperfence|.2f}")
+    return fig
+
+
+# VISUALIZATION 13: Casual riders vs. registered users on holidays and non-holidays
+def rental_comparison(hour_cube):
+    panels = [
+        cube.rollup(hour_cube, ['hr'], ['casual', 'registered'], where={'holiday': 1}),
+        cube.rollup(hour_cube, ['hr'], ['casual', 'registered'], where={'holiday': 0}),
+        cube.rollup(hour_cube, ['hr'], ['casual', 'registered']),
+    ]
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=["Holiday Rentals", "Non-Holiday Rentals", "Total Rentals"],
+        shared_xaxes=True)
+    for row, rentals in enumerate(panels, start=1):
+        # Only the first panel contributes legend entries
+        fig.add_trace(go.Bar(
+            x=rentals["hr"], y=rentals["casual"], name="Casual Riders",
+            marker_color=CASUAL_COLOR, opacity=0.8, showlegend=row == 1), row=row, col=1)
+        fig.add_trace(go.Bar(
+            x=rentals["hr"], y=rentals["registered"], name="Registered Users",
+            marker_color=REGISTERED_COLOR, opacity=0.6, showlegend=row == 1), row=row, col=1)
+        fig.update_yaxes(title_text="Avg Rentals/Hour", row=row, col=1)
+    fig.update_xaxes(title_text="Hour of the Day", row=3, col=1)
+    fig.update_layout(
+        title="Casual Riders vs. Registered Users (Average Rentals)",
+        template='plotly_dark',
+        width=900, height=550,
+        font=dict(size=14),
+        title_font=dict(size=20),
+        margin=_MARGIN)
+    return fig
+
+
+# VISUALIZATION 14: Do casual riders exhibit different seasonal preferences than registered riders?
+def seasonal_stacked(hour_cube):
+    # Season labels as used in this chart of the story
+    season_map = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
+    seasonal_rentals_avg = cube.rollup(hour_cube, ['season'], ['casual', 'registered'])
+    seasonal_rentals_avg['season'] = seasonal_rentals_avg['season'].map(season_map)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=seasonal_rentals_avg['season'],
+        y=seasonal_rentals_avg['casual'],
+        name='Casual Riders',
+        marker_color=CASUAL_COLOR,
+        opacity=0.8))
+    fig.add_trace(go.Bar(
+        x=seasonal_rentals_avg['season'],
+        y=seasonal_rentals_avg['registered'],
+        name='Registered Users',
+        marker_color=REGISTERED_COLOR,
+        opacity=0.6))
+    fig.update_layout(
+        title="Seasonal Preferences: Casual Riders vs. Registered Users (Average Rentals)",
+        xaxis_title="Season",
+        yaxis_title="Avg Rentals per Hour",
+        barmode="stack",
+        bargap=0.2,
+        template='plotly_dark',
+        width=900, height=550,
+        margin=_MARGIN,
+        **_LARGE_FONTS)
+    return fig
+
+
+# VISUALIZATION 15: Feature Importance - Gradient Boosting Regressor
+def feature_importance(feature_importance_df):
+    fig = px.bar(
+        feature_importance_df.sort_values(by="Importance", ascending=True),
+        x="Importance",
+        y="Feature",
+        orientation='h',
+        title="Feature Importance - Gradient Boosting Regressor",
+        labels={"Importance": "Feature Importance Score", "Feature": "Features"},
+        color="Importance",
+        color_continuous_scale="Blues",
+        template='plotly_dark')
+    fig.update_layout(width=900, height=550, margin=_MARGIN, **_LARGE_FONTS)
+    return fig
+
+
+# VISUALIZATION 16: Clustering-Based Demand Classification
+DEMAND_COLORS = {"Low Demand": "#EF553B", "Medium Demand": "#636EFA", "High Demand": "#00CC96"}
+
+
+def demand_scatter(cluster_df, granularity="Days", mode="auto", budget=downsample.POINT_BUDGET):
+    # Hourly segments have enough rows to be thinned like the other scatters
+    fig = _thinned_scatter(
+        cluster_df, "temp", "cnt", mode, budget, color="demand_category",
+        title="Bike Rental Demand Classification by Temperature",
+        labels={"temp": "Temperature", "cnt": "Total Rentals" if granularity == "Days" else "Hourly Rentals",
+                "demand_category": "Demand Category"},
+        color_discrete_map=DEMAND_COLORS,
+        category_orders={"demand_category": list(DEMAND_COLORS)},
+        template="plotly_dark")
+    fig.update_layout(width=900, height=550, margin=_MARGIN, **_LARGE_FONTS)
+    return fig
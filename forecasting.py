@@ -0,0 +1,92 @@
+"""Chronological demand forecasting with lag and rolling features.
+
+The Part 4 regressors score every hour on its own weather and calendar. A
+forecast of the hour `horizon` steps ahead may also use the demand seen up
+to now: `lag_features` places cnt on a gapless hourly timeline (dteday + hr,
+so the hours missing from hour.csv stay missing instead of shifting the
+lags by a row) and takes, for every row,
+
+* cnt at t-h for h in LAGS that are at least `horizon` hours back, plus
+  t-horizon itself (the latest value known when the forecast is made), and
+* trailing means over WINDOWS hours ending at t-horizon,
+
+all with vectorized shift/rolling passes, O(n) in the number of hours. Each
+horizon has its own model (the direct multi-step strategy), trained on the
+earliest rows and tested on the last TEST_FRACTION of the timeline, and is
+compared with a seasonal-naive forecast (the same hour on the latest day
+already known).
+"""
+import numpy as np
+import pandas as pd
+
+import features
+
+LAGS = [1, 24, 168]
+WINDOWS = [24, 168]
+HORIZONS = [1, 24, 168]
+TEST_FRACTION = 0.2
+
+
+def _positions(hour_df):
+    # Hours since the first row on a gapless hourly grid
+    stamps = (hour_df["dteday"].to_numpy().astype("datetime64[h]")
+              + hour_df["hr"].to_numpy().astype("timedelta64[h]"))
+    return (stamps - stamps.min()).astype(np.int64)
+
+
+def _timeline(hour_df, positions):
+    series = np.full(positions.max() + 1, np.nan)
+    series[positions] = hour_df["cnt"].to_numpy(dtype=np.float64)
+    return pd.Series(series)
+
+
+def lag_features(hour_df, horizon=1):
+    """Lags and trailing means of cnt known `horizon` hours before each row."""
+    positions = _positions(hour_df)
+    series = _timeline(hour_df, positions)
+    columns = {}
+    for lag in sorted({horizon, *(lag for lag in LAGS if lag >= horizon)}):
+        columns[f"cnt_lag_{lag}"] = series.shift(lag).to_numpy()[positions]
+    known = series.shift(horizon)
+    for window in WINDOWS:
+        columns[f"cnt_mean_{window}"] = known.rolling(window, min_periods=1).mean().to_numpy()[positions]
+    return pd.DataFrame(columns, index=hour_df.index).astype(np.float32)
+
+
+def build_features(encoder, hour_df, horizon=1):
+    """(X, y): the Part 4 features plus the lag features for `horizon`."""
+    X = features.frame(encoder, features.transform(encoder, hour_df), hour_df.index)
+    return pd.concat([X, lag_features(hour_df, horizon)], axis=1), hour_df["cnt"]
+
+
+def chronological_split(hour_df, test_fraction=TEST_FRACTION):
+    """(train labels, test labels): the last `test_fraction` of the hours is held out."""
+    order = np.argsort(_positions(hour_df), kind="stable")
+    n_train = int(len(order) * (1 - test_fraction))
+    return hour_df.index[order[:n_train]], hour_df.index[order[n_train:]]
+
+
+def seasonal_naive(hour_df, horizon=1):
+    # The same hour on the latest day already known `horizon` hours ahead
+    positions = _positions(hour_df)
+    lag = 24 * -(-horizon // 24)
+    return pd.Series(_timeline(hour_df, positions).shift(lag).to_numpy()[positions], index=hour_df.index)
+
+
+def _scores(y_true, y_pred):
+    from sklearn.metrics import mean_squared_error, r2_score
+    known = ~np.isnan(y_pred)
+    return mean_squared_error(y_true[known], y_pred[known]), r2_score(y_true[known], y_pred[known])
+
+
+def evaluate(X, y, train, test, naive, horizon, data_digest):
+    """Fit (or read the stored scores of) the model for `horizon`, and score the naive forecast on `test`."""
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    import model_store
+
+    # Native missing-value support covers the lags before the first week
+    scores = model_store.fit_or_score(f"Forecast t+{horizon}h", HistGradientBoostingRegressor(random_state=42),
+                                      X.loc[train], y.loc[train], X.loc[test], y.loc[test], data_digest)
+    naive_mse, naive_r2 = _scores(y.loc[test].to_numpy(), naive.loc[test].to_numpy())
+    return {**scores, "Seasonal naive MSE": naive_mse, "Seasonal naive R²": naive_r2}
@@ -0,0 +1,109 @@
+"""2D histogram engine behind the weather heatmap (Visualization 10).
+
+A grid holds, on a fixed fine lattice over the normalized [0, 1] range of
+two columns, the sum of a value and the number of rows in every cell, plus
+the observed min/max of both columns. Chunks are added with `accumulate`,
+partial grids combine with `merge_grids`, and `coarsen` sums fine cells into
+the mean-per-bin table the heatmap draws at any coarser resolution, without
+touching the rows again. The grid's size never depends on the row count.
+
+A grid set holds one grid per pair in PAIRS, keyed "x:y".
+"""
+import numpy as np
+import pandas as pd
+
+FINE_BINS = 200
+DEFAULT_BINS = 10
+PAIRS = [("temp", "hum"), ("atemp", "hum"), ("temp", "windspeed"), ("atemp", "windspeed")]
+# In fine cells; far above float32 rounding, far below the recorded steps
+_EDGE_TOLERANCE = 1e-3
+# Observed ranges are rounded to this many decimals, undoing the float32 cache
+_RANGE_DECIMALS = 6
+
+
+def empty_grid(x="temp", y="hum", value="cnt", bins=FINE_BINS):
+    return {"x": x, "y": y, "value": value, "bins": bins,
+            "sum": np.zeros((bins, bins)), "count": np.zeros((bins, bins), dtype=np.int64),
+            "x_range": [np.inf, -np.inf], "y_range": [np.inf, -np.inf]}
+
+
+def _fine_index(values, bins):
+    # Right-closed cells ((i - 1) / bins, i / bins], like pd.cut's bins. The
+    # tolerance keeps a value stored on a cell edge (hum and temp are recorded
+    # at 0.01 and 0.02 steps, then cached as float32) in the cell it closes
+    cells = np.ceil(np.asarray(values, dtype=np.float64) * bins - _EDGE_TOLERANCE).astype(np.int64) - 1
+    return np.clip(cells, 0, bins - 1)
+
+
+def accumulate(grid, df):
+    """Add the rows of `df` to `grid` in place and return it."""
+    if not len(df):
+        return grid
+    bins = grid["bins"]
+    xs, ys = df[grid["x"]].to_numpy(), df[grid["y"]].to_numpy()
+    cells = _fine_index(xs, bins) * bins + _fine_index(ys, bins)
+    grid["sum"] += np.bincount(cells, weights=df[grid["value"]].to_numpy(dtype=np.float64),
+                               minlength=bins * bins).reshape(bins, bins)
+    grid["count"] += np.bincount(cells, minlength=bins * bins).reshape(bins, bins)
+    grid["x_range"] = [min(grid["x_range"][0], float(xs.min())), max(grid["x_range"][1], float(xs.max()))]
+    grid["y_range"] = [min(grid["y_range"][0], float(ys.min())), max(grid["y_range"][1], float(ys.max()))]
+    return grid
+
+
+def merge_grids(grids):
+    merged = empty_grid(grids[0]["x"], grids[0]["y"], grids[0]["value"], grids[0]["bins"])
+    for grid in grids:
+        merged["sum"] += grid["sum"]
+        merged["count"] += grid["count"]
+        merged["x_range"] = [min(merged["x_range"][0], grid["x_range"][0]), max(merged["x_range"][1], grid["x_range"][1])]
+        merged["y_range"] = [min(merged["y_range"][0], grid["y_range"][0]), max(merged["y_range"][1], grid["y_range"][1])]
+    return merged
+
+
+def empty_grids(pairs=PAIRS):
+    return {f"{x}:{y}": empty_grid(x, y) for x, y in pairs}
+
+
+def accumulate_grids(grids, df):
+    for grid in grids.values():
+        accumulate(grid, df)
+    return grids
+
+
+def merge_grid_sets(grid_sets):
+    return {key: merge_grids([grids[key] for grids in grid_sets]) for key in grid_sets[0]}
+
+
+def coarsen(grid, bins=DEFAULT_BINS):
+    """Mean value per coarse bin, labelled "lo - hi" like the pivot-table heatmap.
+
+    Coarse edges span x's observed range and y from 0 to its maximum, and
+    bins are right-closed with the lowest x included, as the original
+    pd.cut bins were. Each fine cell goes to the coarse bin holding its right
+    edge, so values on the fine lattice (every hum and temp value of
+    hour.csv) land in the same bin as with pd.cut. A value off the lattice
+    (atemp, windspeed) can move to the neighbouring bin when a coarse edge
+    cuts its fine cell. Unlike pd.cut, the first y bin also holds y == 0,
+    so calm hours stay on the windspeed heatmap.
+    """
+    x_lo, x_hi = (round(v, _RANGE_DECIMALS) for v in grid["x_range"])
+    x_edges = np.linspace(x_lo, x_hi, bins + 1)
+    y_edges = np.linspace(0, round(grid["y_range"][1], _RANGE_DECIMALS), bins + 1)
+    right_edges = np.arange(1, grid["bins"] + 1) / grid["bins"]
+    x_coarse = np.clip(np.searchsorted(x_edges, right_edges, side="left") - 1, 0, bins - 1)
+    y_coarse = np.clip(np.searchsorted(y_edges, right_edges, side="left") - 1, 0, bins - 1)
+
+    def regroup(values):
+        rows = np.zeros((bins, grid["bins"]), dtype=values.dtype)
+        np.add.at(rows, x_coarse, values)
+        out = np.zeros((bins, bins), dtype=values.dtype)
+        np.add.at(out.T, y_coarse, rows.T)
+        return out
+
+    sums, counts = regroup(grid["sum"]), regroup(grid["count"])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+
+    def labels(edges):
+        return [f"{lo:.2f} - {hi:.2f}" for lo, hi in zip(edges[:-1], edges[1:])]
+    return pd.DataFrame(means, index=labels(x_edges), columns=labels(y_edges))
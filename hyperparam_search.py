@@ -0,0 +1,149 @@
+"""Resumable successive-halving hyperparameter search for Part 4.
+
+Every grid point starts on a small subsample of the training rows; after
+each rung only the best third is promoted to three times as many rows, so
+the full training set is only ever used for the few strongest candidates.
+Each evaluated (configuration, sample size) pair is appended to an on-disk
+trial log. Rerunning the search replays the log and evaluates only the
+trials that are missing, so an interrupted search resumes where it stopped
+and extending a grid only costs the new points.
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesRegressor, GradientBoostingRegressor, RandomForestRegressor
+from sklearn.model_selection import KFold, cross_val_score
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+import model_store
+
+TRIAL_LOG = os.environ.get("BIKE_TRIAL_LOG", os.path.join(".cache", "search", "trials.jsonl"))
+ETA = 3
+CV_FOLDS = 3
+MIN_RESOURCES = 500
+
+# Model name -> (estimator class, fixed parameters, grid to search)
+SEARCH_SPACES = {
+    "Random Forest": (RandomForestRegressor, {"n_estimators": 100, "random_state": 42}, {
+        "max_depth": [10, 20, None],
+        "min_samples_leaf": [1, 2, 4]}),
+    "Gradient Boosting": (GradientBoostingRegressor, {"random_state": 42}, {
+        "learning_rate": [0.05, 0.1],
+        "max_depth": [3, 5, 7],
+        "min_samples_leaf": [1, 3]}),
+    "k-Nearest Neighbors": (KNeighborsRegressor, {}, {
+        "n_neighbors": [3, 5, 7, 9],
+        "p": [1, 2],
+        "weights": ["uniform", "distance"]}),
+    "Decision Tree": (DecisionTreeRegressor, {"random_state": 42}, {
+        "max_depth": [5, 10, 20],
+        "min_samples_leaf": [1, 2, 4]}),
+    "Extra Trees": (ExtraTreesRegressor, {"n_estimators": 100, "random_state": 42}, {
+        "max_depth": [10, 20, None],
+        "min_samples_leaf": [1, 2, 4]}),
+}
+
+_lock = threading.Lock()
+
+
+def _params_key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+def _grid(grid):
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def search_context(name, X, data_digest):
+    # Trials are only comparable when the data, rows, columns, fixed
+    # parameters and CV setup are identical
+    estimator, fixed, _ = SEARCH_SPACES[name]
+    payload = {
+        "model": name,
+        "class": estimator.__name__,
+        "fixed": fixed,
+        "columns": model_store.column_signature(X),
+        "rows": model_store.rows_digest(X),
+        "data": data_digest,
+        "eta": ETA,
+        "cv": CV_FOLDS,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+
+def read_trials(log_path=TRIAL_LOG):
+    """Return {(context, params_key, resource): trial} for every logged trial."""
+    return model_store.read_log(
+        log_path, lambda trial: (trial["context"], _params_key(trial["params"]), trial["resource"]))
+
+
+def _schedule(n_candidates, n_samples):
+    n_rungs = 1 + int(math.floor(math.log(max(n_candidates, 1), ETA)))
+    return [max(min(MIN_RESOURCES, n_samples), n_samples // ETA ** (n_rungs - 1 - i))
+            for i in range(n_rungs)]
+
+
+def search_model(name, X, y, data_digest, log_path=TRIAL_LOG, trials=None, on_trial=None):
+    """Run (or resume) successive halving for one model and return its best trial."""
+    estimator, fixed, grid = SEARCH_SPACES[name]
+    context = search_context(name, X, data_digest)
+    trials = read_trials(log_path) if trials is None else trials
+    # A fixed permutation so every rung's subsample is a prefix of the next one
+    order = np.random.default_rng(42).permutation(len(X))
+    cv = KFold(n_splits=CV_FOLDS, shuffle=True, random_state=42)
+
+    candidates = _grid(grid)
+    rung_trials = []
+    for resource in _schedule(len(candidates), len(X)):
+        rows = order[:resource]
+        rung_trials = []
+        for params in candidates:
+            key = (context, _params_key(params), int(resource))
+            trial = trials.get(key)
+            if trial is None:
+                start = time.perf_counter()
+                scores = cross_val_score(estimator(**fixed, **params), X.iloc[rows], y.iloc[rows],
+                                         cv=cv, scoring="r2")
+                trial = {
+                    "context": context,
+                    "model": name,
+                    "params": params,
+                    "resource": int(resource),
+                    "score": float(scores.mean()),
+                    "score_std": float(scores.std()),
+                    "seconds": time.perf_counter() - start,
+                }
+                model_store.append_log(log_path, trial)
+                trials[key] = trial
+                if on_trial is not None:
+                    on_trial(trial)
+            rung_trials.append(trial)
+        rung_trials.sort(key=lambda t: t["score"], reverse=True)
+        candidates = [t["params"] for t in rung_trials[:max(1, math.ceil(len(rung_trials) / ETA))]]
+    return rung_trials[0]
+
+
+def run_search(X, y, data_digest, models=None, log_path=TRIAL_LOG, on_trial=None):
+    """Search every model in `models` (default: all of SEARCH_SPACES); returns {name: best trial}."""
+    with _lock:
+        trials = read_trials(log_path)
+        return {name: search_model(name, X, y, data_digest, log_path, trials, on_trial)
+                for name in (models or SEARCH_SPACES)}
+
+
+def results_table(best):
+    return pd.DataFrame({
+        "Model": list(best),
+        "Best Parameters": [str(trial["params"]) for trial in best.values()],
+        "Best R² Score": [round(trial["score"], 3) for trial in best.values()],
+    })
@@ -0,0 +1,251 @@
+"""Append new day/hour records without recomputing history.
+
+day.csv and hour.csv stay untouched. `append` validates new records against
+their schema, stores them as Feather delta files partitioned by (yr, mnth)
+under INGEST_DIR, and updates the aggregates of the appended rows in place:
+
+* one cube per partition and table (cube.merge_cubes of the new rows into
+  the touched partitions only),
+* the weather heatmap grids (heatmap.accumulate_grids), and
+* the day-level demand segmentation, moved by a mini-batch k-means step
+  (segmentation.update).
+
+Readers add these to the aggregates of the base files, which stay cached.
+Every append bumps `revision` and the row count of each (table, yr, mnth)
+partition it touched. Readers key their caches on `partition_version` of
+the partitions they read, so an hourly append leaves day-level data alone,
+and a chart restricted to one year is kept when another year grows. The
+state belongs to one version of the base files; replacing day.csv or
+hour.csv discards it.
+
+Usage: python ingest.py [--hour new_hours.csv] [--day new_days.csv]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+import cube
+import data_cache
+import heatmap
+import segmentation
+
+INGEST_DIR = os.environ.get("BIKE_INGEST_DIR", os.path.join(".cache", "ingest"))
+BASE_FILES = {"day": "day.csv", "hour": "hour.csv"}
+DIMS = {"day": cube.DAY_DIMS, "hour": cube.HOUR_DIMS}
+FIRST_YEAR = 2011
+
+RANGES = {
+    "season": (1, 4), "mnth": (1, 12), "hr": (0, 23), "holiday": (0, 1), "weekday": (0, 6),
+    "workingday": (0, 1), "weathersit": (1, 4),
+    "temp": (0, 1), "atemp": (0, 1), "hum": (0, 1), "windspeed": (0, 1),
+}
+
+_state_cache = {}
+
+
+def _state_path(root):
+    return os.path.join(root, "state.joblib")
+
+
+def base_fingerprint():
+    return "".join(data_cache.file_digest(path)[:16] for path in BASE_FILES.values())
+
+
+def _empty_state():
+    return {"base": base_fingerprint(), "revision": 0, "partitions": {}, "cubes": {}, "grids": None,
+            "segments": None}
+
+
+def load_state(root=INGEST_DIR):
+    """Current append state; re-read only when the state file changes."""
+    path = _state_path(root)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return _empty_state()
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _state_cache.get(path)
+    if cached and cached[0] == stamp:
+        state = cached[1]
+    else:
+        state = joblib.load(path)
+        _state_cache[path] = (stamp, state)
+    # Deltas recorded against other base files do not apply to these
+    return state if state["base"] == base_fingerprint() else _empty_state()
+
+
+def _save_state(state, root):
+    os.makedirs(root, exist_ok=True)
+    path = _state_path(root)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(state, tmp)
+    os.replace(tmp, path)
+
+
+def revision(root=INGEST_DIR):
+    return load_state(root)["revision"]
+
+
+def partition_version(table, years=None, root=INGEST_DIR):
+    """Version of the appended rows of `table` in `years` (all years when None).
+
+    Appends only add rows, so the row counts of the matching partitions
+    change exactly when their data does. "0" when nothing was appended.
+    """
+    counts = sorted([yr, mnth, rows] for (t, yr, mnth), rows in load_state(root)["partitions"].items()
+                    if t == table and (years is None or yr in years))
+    if not counts:
+        return "0"
+    return hashlib.sha256(json.dumps(counts).encode("utf-8")).hexdigest()[:12]
+
+
+def appended_rows(table, root=INGEST_DIR):
+    return sum(rows for (t, _, _), rows in load_state(root)["partitions"].items() if t == table)
+
+
+def validate(table, records, existing_keys):
+    """Return `records` cast to the base schema, or raise ValueError listing every problem."""
+    df = pd.DataFrame(records).reset_index(drop=True)
+    columns = list(data_cache.load_table(BASE_FILES[table]).columns)
+    problems = []
+    missing = [c for c in columns if c not in df.columns]
+    extra = [c for c in df.columns if c not in columns]
+    if missing:
+        problems.append(f"missing columns: {missing}")
+    if extra:
+        problems.append(f"unknown columns: {extra}")
+    if problems:
+        raise ValueError(f"{table} records: " + "; ".join(problems))
+    df = df[columns].copy()
+    try:
+        df["dteday"] = pd.to_datetime(df["dteday"])
+        numeric = [c for c in columns if c in data_cache.DTYPES]
+        df[numeric] = df[numeric].apply(pd.to_numeric)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"{table} records: {exc}") from exc
+
+    # Ranges are checked before the cast to the compact dtypes, which would wrap
+    for col, (lo, hi) in RANGES.items():
+        if col in df.columns and not df[col].between(lo, hi).all():
+            problems.append(f"{col} outside [{lo}, {hi}]")
+    if (df[["casual", "registered"]] < 0).any().any():
+        problems.append("negative counts")
+    if not (df["cnt"] == df["casual"] + df["registered"]).all():
+        problems.append("cnt != casual + registered")
+    if not (df["yr"] == df["dteday"].dt.year - FIRST_YEAR).all():
+        problems.append(f"yr does not match dteday (yr 0 is {FIRST_YEAR})")
+    if not (df["mnth"] == df["dteday"].dt.month).all():
+        problems.append("mnth does not match dteday")
+    keys = _keys(table, df)
+    if keys.duplicated().any():
+        problems.append("duplicate records in the batch")
+    if keys.isin(existing_keys).any():
+        problems.append(f"{int(keys.isin(existing_keys).sum())} record(s) already ingested")
+    if problems:
+        raise ValueError(f"{table} records: " + "; ".join(problems))
+    return df.astype({c: t for c, t in data_cache.DTYPES.items() if c in df.columns})
+
+
+def _keys(table, df):
+    # One record per day, or per day and hour
+    days = df["dteday"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    return pd.Series(days * 24 + df["hr"].to_numpy() if table == "hour" else days)
+
+
+def load_deltas(table, root=INGEST_DIR):
+    """All appended rows of `table` ("day" or "hour"), or None when there are none."""
+    if not load_state(root)["revision"]:
+        return None
+    paths = sorted(glob.glob(os.path.join(root, table, "yr=*", "mnth=*", "*.feather")))
+    if not paths:
+        return None
+    return pd.concat([feather.read_feather(p) for p in paths], ignore_index=True)
+
+
+def delta_cube(table, root=INGEST_DIR):
+    cubes = [c for (t, _, _), c in sorted(load_state(root)["cubes"].items()) if t == table]
+    return cube.merge_cubes(cubes, DIMS[table]) if cubes else None
+
+
+def delta_grids(root=INGEST_DIR):
+    return load_state(root).get("grids")
+
+
+def demand_segments(root=INGEST_DIR):
+    """Day-level demand segmentation kept current by `append`, or None."""
+    return load_state(root).get("segments")
+
+
+def append(hour_records=None, day_records=None, root=INGEST_DIR):
+    """Validate and store new records and update the delta aggregates.
+
+    Returns the new revision and the (table, yr, mnth) partitions it touched.
+    Nothing is written unless every record passes validation.
+    """
+    state = load_state(root)
+    batches = {}
+    for table, records in (("hour", hour_records), ("day", day_records)):
+        if records is None or not len(records):
+            continue
+        existing = [data_cache.load_table(BASE_FILES[table])]
+        deltas = load_deltas(table, root)
+        if deltas is not None:
+            existing.append(deltas)
+        existing_keys = pd.concat([_keys(table, df) for df in existing], ignore_index=True)
+        batches[table] = validate(table, records, existing_keys)
+    if not batches:
+        return {"revision": state["revision"], "partitions": []}
+
+    state = {**state, "revision": state["revision"] + 1,
+             "partitions": dict(state["partitions"]), "cubes": dict(state["cubes"])}
+    touched = []
+    for table, df in batches.items():
+        for (yr, mnth), part in df.groupby(["yr", "mnth"], sort=True):
+            key = (table, int(yr), int(mnth))
+            part_dir = os.path.join(root, table, f"yr={int(yr)}", f"mnth={int(mnth)}")
+            os.makedirs(part_dir, exist_ok=True)
+            path = os.path.join(part_dir, f"part-{state['revision']:06d}.feather")
+            feather.write_feather(part.reset_index(drop=True), f"{path}.tmp", compression="uncompressed")
+            os.replace(f"{path}.tmp", path)
+            # Only the cube of a touched partition changes
+            part_cube = cube.build_cube(part, DIMS[table])
+            previous = state["cubes"].get(key)
+            state["cubes"][key] = part_cube if previous is None else cube.merge_cubes([previous, part_cube], DIMS[table])
+            state["partitions"][key] = state["partitions"].get(key, 0) + len(part)
+            touched.append(key)
+
+    if "hour" in batches:
+        grids = state.get("grids") or heatmap.empty_grids()
+        # Merged into a copy: the loaded state may be shared with readers
+        state["grids"] = heatmap.accumulate_grids(heatmap.merge_grid_sets([grids]), batches["hour"])
+    if "day" in batches:
+        model = state.get("segments")
+        if model is None:
+            model = segmentation.fit(data_cache.load_table(BASE_FILES["day"]))
+        state["segments"] = segmentation.update(model, batches["day"])
+    _save_state(state, root)
+    return {"revision": state["revision"], "partitions": touched}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hour", help="CSV of new hour records with hour.csv's columns")
+    parser.add_argument("--day", help="CSV of new day records with day.csv's columns")
+    parser.add_argument("--root", default=INGEST_DIR)
+    args = parser.parse_args()
+    result = append(pd.read_csv(args.hour) if args.hour else None,
+                    pd.read_csv(args.day) if args.day else None, root=args.root)
+    print(f"revision {result['revision']}: {len(result['partitions'])} partition(s) updated")
+    for table, yr, mnth in result["partitions"]:
+        print(f"  {table} yr={yr} mnth={mnth}")
+
+
+if __name__ == "__main__":
+    main()
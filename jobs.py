@@ -0,0 +1,111 @@
+"""Background jobs for the slow Part 4 work.
+
+A job runs a function on a small process-wide thread pool instead of inside
+the Streamlit script, so a page renders straight away and shows the results
+as they arrive. Jobs are keyed. A key that is already queued, running or
+finished returns the existing job: concurrent first-time viewers share one
+set of fits, and later sessions reuse the finished result. A failed job is
+kept with its error until `retry` clears it, so a failure that recurs is
+not restarted by every rerun of the page.
+
+The function is called with an extra `on_result(name, value)` keyword, and
+each call is kept on the job as a partial result. The heavy lifting inside a
+job (training.py's process pool, the model store, the trial and fold logs)
+is unchanged, so finished artifacts land where every session already looks.
+
+Those jobs each fan out over every core (training.TRAIN_WORKERS processes,
+share_cores threads), so by default they run one at a time: two running
+together would each size their pool for the whole machine and oversubscribe
+it. Later jobs wait in the queue and start as soon as the one ahead finishes.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# One CPU-heavy job at a time; raise only if the jobs' own pools are shrunk to match
+JOB_WORKERS = int(os.environ.get("BIKE_JOB_WORKERS", 1))
+# Finished jobs kept for reuse; the oldest beyond this are forgotten
+KEEP_FINISHED = 64
+POLL_SECONDS = 1.0
+
+_jobs = OrderedDict()
+_lock = threading.Lock()
+_executor = None
+
+
+class Job:
+    def __init__(self, key):
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = self.finished = None
+        self._partial = {}
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def report(self, name, value):
+        with self._lock:
+            self._partial[name] = value
+
+    def partial(self):
+        """Results reported so far, in the order they arrived."""
+        with self._lock:
+            return dict(self._partial)
+
+    def elapsed(self):
+        return (self.finished or time.time()) - (self.started or self.submitted)
+
+
+def _run(job, fn, args, kwargs):
+    job.started = time.time()
+    job.status = "running"
+    try:
+        job.result = fn(*args, on_result=job.report, **kwargs)
+        job.status = "done"
+    except Exception as e:
+        job.error = f"{type(e).__name__}: {e}"
+        job.status = "failed"
+    finally:
+        job.finished = time.time()
+
+
+def _trim():
+    finished = [key for key, job in _jobs.items() if job.done]
+    for key in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+        del _jobs[key]
+
+
+def submit(key, fn, *args, **kwargs):
+    """Return the job for `key`, starting `fn(*args, on_result=..., **kwargs)` if there is none."""
+    global _executor
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None:
+            _jobs.move_to_end(key)
+            return job
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="bike-job")
+        job = _jobs[key] = Job(key)
+        _trim()
+        _executor.submit(_run, job, fn, args, kwargs)
+        return job
+
+
+def retry(key):
+    """Forget the failed job for `key`, so the next submit starts it again."""
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.status == "failed":
+            del _jobs[key]
+
+
+def active():
+    with _lock:
+        return [job for job in _jobs.values() if not job.done]
@@ -0,0 +1,228 @@
+"""Persistent store for the fitted Part 4 models.
+
+Every entry holds a fitted estimator together with its test-set MSE and R².
+The scores are also written to a small JSON file next to the pickle, so the
+comparison table is filled without unpickling (or keeping in memory) any
+estimator; the estimator itself is loaded only when something predicts.
+Entries are keyed by a hash of the estimator class and hyperparameters, the
+encoded feature columns, the train/test split and the contents of the
+training CSV, so changing any of those only invalidates the affected models.
+The same column signature and row digest key the append-only JSONL logs of
+the hyperparameter search and cross-validation (read_log/append_log).
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+
+import joblib
+from sklearn.metrics import mean_squared_error, r2_score
+
+STORE_DIR = os.environ.get("BIKE_MODEL_STORE", os.path.join(".cache", "models"))
+# Bump when the layout of a stored entry changes
+STORE_VERSION = 1
+
+# Parameters that change how a model is fitted, not what it learns
+_RUNTIME_PARAMS = {"n_jobs", "nthread", "verbose", "verbosity"}
+
+# name -> (key, entry): only the current version of each model stays resident
+_memory = {}
+_lock = threading.Lock()
+
+
+def _library_version(model):
+    package = type(model).__module__.split(".")[0]
+    return getattr(sys.modules.get(package), "__version__", "unknown")
+
+
+def model_key(name, model, columns, split_digest, data_digest):
+    payload = {
+        "store": STORE_VERSION,
+        "name": name,
+        "class": f"{type(model).__module__}.{type(model).__qualname__}",
+        "library": _library_version(model),
+        "params": {k: v for k, v in model.get_params(deep=True).items() if k not in _RUNTIME_PARAMS},
+        "columns": list(columns),
+        "split": split_digest,
+        "data": data_digest,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+
+def column_signature(X):
+    # Dtypes are part of it: float32 and float64 inputs fit slightly different models
+    return [f"{column}:{dtype}" for column, dtype in X.dtypes.items()]
+
+
+def rows_digest(X):
+    return hashlib.sha256(X.index.to_numpy().tobytes()).hexdigest()
+
+
+def read_log(log_path, key):
+    """Return {key(record): record} for every record of the JSONL log at `log_path`."""
+    records = {}
+    if not os.path.exists(log_path):
+        return records
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a half-written line from an interrupted run
+            records[key(record)] = record
+    return records
+
+
+def append_log(log_path, record):
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+
+
+def split_digest(X_train, X_test):
+    h = hashlib.sha256()
+    h.update(X_train.index.to_numpy().tobytes())
+    h.update(X_test.index.to_numpy().tobytes())
+    return h.hexdigest()[:24]
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _entry_path(name, key):
+    return os.path.join(STORE_DIR, f"{_slug(name)}-{key}.joblib")
+
+
+def _scores_path(name, key):
+    return os.path.join(STORE_DIR, f"{_slug(name)}-{key}.json")
+
+
+def _scores(entry):
+    return {"MSE": float(entry["MSE"]), "R²": float(entry["R²"])}
+
+
+def _write_scores(name, key, scores):
+    path = _scores_path(name, key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(scores, f)
+    os.replace(tmp, path)
+
+
+def _remember(name, key, entry):
+    # Replaces any other version of `name`, so superseded estimators are freed
+    _memory[name] = (key, entry)
+
+
+def load(name, key):
+    cached = _memory.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    path = _entry_path(name, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        entry = joblib.load(path)
+    except Exception:
+        # A truncated or incompatible pickle is treated as a cache miss
+        return None
+    _remember(name, key, entry)
+    return entry
+
+
+def load_scores(name, key):
+    """{"MSE", "R²"} of a stored entry, or None, without loading its estimator."""
+    try:
+        with open(_scores_path(name, key), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        pass
+    # Entries saved before the scores file existed get one on first read
+    path = _entry_path(name, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        scores = _scores(joblib.load(path))
+    except Exception:
+        return None
+    _write_scores(name, key, scores)
+    return scores
+
+
+def latest(name):
+    """Most recently saved entry for `name` whatever its key, or None.
+
+    Inference uses this to pick up the model the app last trained without
+    rebuilding the training split that keys it.
+    """
+    prefix = f"{_slug(name)}-"
+    try:
+        names = [f for f in os.listdir(STORE_DIR) if f.startswith(prefix) and f.endswith(".joblib")]
+    except FileNotFoundError:
+        return None
+    for fname in sorted(names, key=lambda f: os.path.getmtime(os.path.join(STORE_DIR, f)), reverse=True):
+        entry = load(name, fname[len(prefix):-len(".joblib")])
+        if entry is not None:
+            return entry
+    return None
+
+
+def save(name, key, entry):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _entry_path(name, key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    joblib.dump(entry, tmp)
+    os.replace(tmp, path)
+    _write_scores(name, key, _scores(entry))
+    # Drop older versions of the same model so the store does not grow forever
+    prefix = f"{_slug(name)}-"
+    for fname in os.listdir(STORE_DIR):
+        if fname.startswith(prefix) and fname.endswith((".joblib", ".json")) and key not in fname:
+            try:
+                os.remove(os.path.join(STORE_DIR, fname))
+            except OSError:
+                pass
+    _remember(name, key, entry)
+
+
+def entry_key(name, model, X_train, X_test, data_digest):
+    return model_key(name, model, column_signature(X_train), split_digest(X_train, X_test), data_digest)
+
+
+def fit_and_score(model, X_train, y_train, X_test, y_test):
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+    return {
+        "model": model,
+        "MSE": mean_squared_error(y_test, y_pred),
+        "R²": r2_score(y_test, y_pred),
+    }
+
+
+def fit_or_load(name, model, X_train, y_train, X_test, y_test, data_digest):
+    """Return {"model", "MSE", "R²"} for `model`, fitting it only on a store miss."""
+    key = entry_key(name, model, X_train, X_test, data_digest)
+    entry = load(name, key)
+    if entry is not None:
+        return entry
+    with _lock:
+        # Another session may have fitted the same model while we waited
+        entry = load(name, key)
+        if entry is not None:
+            return entry
+        entry = fit_and_score(model, X_train, y_train, X_test, y_test)
+        save(name, key, entry)
+    return entry
+
+
+def fit_or_score(name, model, X_train, y_train, X_test, y_test, data_digest):
+    """Return {"MSE", "R²"} for `model`, from its scores file when it is already stored."""
+    scores = load_scores(name, entry_key(name, model, X_train, X_test, data_digest))
+    if scores is not None:
+        return scores
+    return _scores(fit_or_load(name, model, X_train, y_train, X_test, y_test, data_digest))
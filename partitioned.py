@@ -0,0 +1,66 @@
+"""Partitioned, multi-core aggregation of the hour-level data.
+
+The charts read the hourly cube (cube.py) and the weather heatmap grids
+(heatmap.py), and both are sums and counts. `aggregate_hour` therefore
+splits the rows into partitions on PARTITION_BY (year and month here; a
+city column partitions the same way), builds each partition's cube and
+grids in a loky process pool, and merges the partials with
+cube.merge_cubes and heatmap.merge_grid_sets. The merge is exact, so the
+aggregates, and every chart rolled up from them, are the same as those from
+a single pass. Only the columns the aggregates read are sent to the workers,
+and the workers are kept warm between builds.
+
+Below PARALLEL_MIN_ROWS the pool costs more to start and feed than it saves,
+so the rows are aggregated in one pass in this process.
+"""
+import os
+
+import numpy as np
+from joblib.externals.loky import get_reusable_executor
+
+import cube
+import heatmap
+
+PARTITION_BY = os.environ.get("BIKE_PARTITION_BY", "yr,mnth").split(",")
+AGG_WORKERS = int(os.environ.get("BIKE_AGG_WORKERS", os.cpu_count() or 1))
+PARALLEL_MIN_ROWS = int(os.environ.get("BIKE_PARALLEL_MIN_ROWS", 2_000_000))
+# Idle workers are kept this long, so a rebuild after an ingest skips the start-up
+WORKER_IDLE_SECONDS = 300
+
+
+def _shipped(df):
+    # The columns the aggregates read, in the narrowest exact dtypes (the
+    # weather columns stay float64 so fine-cell assignment is unchanged)
+    grid_columns = [c for x, y in heatmap.PAIRS for c in (x, y)]
+    columns = [c for c in dict.fromkeys([*cube.HOUR_DIMS, *cube.MEASURES, *grid_columns]) if c in df.columns]
+    return df[columns].astype({**{d: "int8" for d in cube.HOUR_DIMS}, **{m: "int32" for m in cube.MEASURES}})
+
+
+def partitions(df, by=PARTITION_BY):
+    """Row positions of each partition of `df`, largest first."""
+    groups = df.groupby(by, observed=True, sort=False).indices
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def _aggregate(part):
+    return cube.build_cube(part, cube.HOUR_DIMS), heatmap.accumulate_grids(heatmap.empty_grids(), part)
+
+
+def aggregate_hour(df, by=PARTITION_BY, max_workers=None, min_rows=PARALLEL_MIN_ROWS):
+    """{"cube", "grids", "partitions"}: the hourly cube and heatmap grid set of `df`."""
+    max_workers = max_workers or AGG_WORKERS
+    parts = partitions(df, by) if len(df) >= min_rows and max_workers > 1 else []
+    workers = min(max_workers, len(parts))
+    if workers < 2:
+        hour_cube, grids = _aggregate(df)
+        return {"cube": hour_cube, "grids": grids, "partitions": 1}
+
+    # numpy's bincount and pandas' groupby are single-threaded, one core per worker is enough
+    env = {var: "1" for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")}
+    executor = get_reusable_executor(max_workers=workers, env=env, timeout=WORKER_IDLE_SECONDS)
+    rows = _shipped(df)
+    futures = [executor.submit(_aggregate, rows.take(np.sort(positions))) for positions in parts]
+    partials = [future.result() for future in futures]
+    return {"cube": cube.merge_cubes([c for c, _ in partials], cube.HOUR_DIMS),
+            "grids": heatmap.merge_grid_sets([g for _, g in partials]),
+            "partitions": len(parts)}
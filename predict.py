@@ -0,0 +1,167 @@
+"""Batch demand forecasts from the tuned Gradient Boosting model of Part 4.
+
+The model is the one Part 4 last persisted in model_store ("Tuned Gradient
+Boosting"); open the Predictive Modelling page once to train it. It is
+loaded once per process. Scenarios are (hour, weather) rows with the Part 4
+features: temp, hum, windspeed, hr, weekday (0-6 or Sunday..Saturday),
+weathersit (1-4) and holiday (0/1). They are encoded by the frozen feature
+encoder Part 4 trained with (features.py), so the columns always match the
+model, and predicted in vectorized chunks. Categories the encoder was not
+fitted on are rejected.
+
+Usage:
+    python predict.py scenarios.csv|scenarios.parquet [--output forecasts.csv] [--chunk-rows 50000]
+    python predict.py --serve [--port 8502]
+
+The server answers POST /predict with a CSV body (Content-Type: text/csv) or
+a JSON list of scenario objects, and returns JSON with the predictions and
+timing stats. GET /health reports the loaded model.
+"""
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import features
+import model_store
+
+MODEL_NAME = "Tuned Gradient Boosting"
+CHUNK_ROWS = int(os.environ.get("BIKE_PREDICT_CHUNK_ROWS", 50_000))
+
+_loaded = None
+_load_lock = threading.Lock()
+
+
+def load_model():
+    """(model, feature encoder) as persisted by Part 4, loaded on first use."""
+    global _loaded
+    with _load_lock:
+        if _loaded is None:
+            entry = model_store.latest(MODEL_NAME)
+            encoder = features.load_encoder()
+            if entry is None or encoder is None:
+                raise LookupError(f"No '{MODEL_NAME}' and feature encoder in {model_store.STORE_DIR}; "
+                                  "open the Predictive Modelling page once to train them.")
+            if list(entry["model"].feature_names_in_) != encoder["columns"]:
+                raise LookupError("The stored model and feature encoder disagree on the columns; "
+                                  "open the Predictive Modelling page to refresh them.")
+            _loaded = entry["model"], encoder
+        return _loaded
+
+
+def read_scenarios(source):
+    if isinstance(source, pd.DataFrame):
+        return source
+    if str(source).lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
+
+
+def predict(scenarios, chunk_rows=CHUNK_ROWS):
+    """Return (predictions Series, stats dict) for a CSV/Parquet path or DataFrame."""
+    model, encoder = load_model()
+    scenarios = read_scenarios(scenarios)
+    start = time.perf_counter()
+    out = np.empty(len(scenarios), dtype=np.float64)
+    latencies = []
+    for lo in range(0, len(scenarios), chunk_rows):
+        chunk_start = time.perf_counter()
+        chunk = scenarios.iloc[lo:lo + chunk_rows]
+        out[lo:lo + len(chunk)] = model.predict(features.frame(encoder, features.transform(encoder, chunk)))
+        latencies.append(time.perf_counter() - chunk_start)
+    seconds = time.perf_counter() - start
+    latencies = np.array(latencies or [0.0]) * 1000
+    stats = {
+        "rows": len(scenarios),
+        "chunks": len(latencies),
+        "seconds": seconds,
+        "rows_per_second": len(scenarios) / seconds if seconds else None,
+        "chunk_latency_ms": {"p50": float(np.percentile(latencies, 50)),
+                             "p95": float(np.percentile(latencies, 95)),
+                             "max": float(latencies.max())},
+    }
+    return pd.Series(out, index=scenarios.index, name="predicted_cnt"), stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _model(self):
+        # No trained model yet is the server's state, not the client's error
+        try:
+            return load_model()
+        except LookupError as exc:
+            self._reply(503, {"error": str(exc)})
+            return None
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply(404, {"error": "not found"})
+        loaded = self._model()
+        if loaded is not None:
+            self._reply(200, {"model": MODEL_NAME, "columns": loaded[1]["columns"]})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            return self._reply(404, {"error": "not found"})
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self._model() is None:
+            return
+        try:
+            if "csv" in self.headers.get("Content-Type", ""):
+                scenarios = pd.read_csv(io.BytesIO(body))
+            else:
+                scenarios = pd.DataFrame(json.loads(body))
+            predictions, stats = predict(scenarios)
+        except (ValueError, KeyError, TypeError) as exc:
+            # Malformed scenarios are the client's error, reported as JSON rather than a dropped connection
+            return self._reply(400, {"error": str(exc)})
+        self._reply(200, {"predictions": predictions.tolist(), "stats": stats})
+
+
+def serve(port):
+    load_model()
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    print(f"serving {MODEL_NAME} on http://127.0.0.1:{port}/predict")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="?", help="CSV or Parquet file of scenarios")
+    parser.add_argument("--output", help="write the scenarios with a predicted_cnt column here")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--serve", action="store_true", help="start the HTTP endpoint instead")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.port)
+    if not args.scenarios:
+        parser.error("a scenarios file is required unless --serve is given")
+
+    scenarios = read_scenarios(args.scenarios)
+    predictions, stats = predict(scenarios, args.chunk_rows)
+    if args.output:
+        scenarios.assign(predicted_cnt=predictions).to_csv(args.output, index=False)
+    else:
+        print(predictions.describe().to_string())
+    latency = stats["chunk_latency_ms"]
+    print(f"{stats['rows']:,} rows in {stats['chunks']} chunk(s): {stats['seconds']:.3f} s, "
+          f"{stats['rows_per_second']:,.0f} rows/s, chunk latency p50 {latency['p50']:.1f} ms, "
+          f"p95 {latency['p95']:.1f} ms, max {latency['max']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Per-run stage timings for the Streamlit script.
+
+`start_run()` opens a recording for the current script run (per thread, so
+concurrent sessions do not mix). Every `with stage(name):` block inside it
+records wall time, process CPU time and the process' peak RSS. `finish_run()`
+appends the records to a JSON-lines log so timings can be compared across
+deployments. Outside a run, `stage()` does nothing.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_LOG = os.environ.get("BIKE_PROFILE_LOG", os.path.join(".cache", "profile.jsonl"))
+DEPLOYMENT = os.environ.get("BIKE_DEPLOYMENT", "dev")
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def start_run():
+    _local.run = {"run_id": uuid.uuid4().hex[:12], "started": time.time(), "records": [], "depth": 0}
+
+
+def records():
+    run = getattr(_local, "run", None)
+    return list(run["records"]) if run else []
+
+
+@contextmanager
+def stage(name):
+    run = getattr(_local, "run", None)
+    if run is None:
+        yield
+        return
+    record = {"stage": name, "depth": run["depth"]}
+    # Appended up front so records stay in start order when stages nest
+    run["records"].append(record)
+    run["depth"] += 1
+    rss_before = peak_rss_mb()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        # CPU time is process-wide: it includes other sessions' threads and
+        # BLAS/OpenMP helpers, but not child processes such as the training pool
+        record["wall_s"] = time.perf_counter() - wall
+        record["cpu_s"] = time.process_time() - cpu
+        record["peak_rss_mb"] = peak_rss_mb()
+        if rss_before is not None:
+            record["rss_growth_mb"] = record["peak_rss_mb"] - rss_before
+        run["depth"] -= 1
+
+
+def finish_run(page=None, log_path=PROFILE_LOG):
+    """Close the current run, append it to `log_path` (if set) and return its records."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return []
+    _local.run = None
+    if log_path:
+        meta = {"run_id": run["run_id"], "started": run["started"], "page": page,
+                "deployment": DEPLOYMENT, "host": socket.gethostname(), "pid": os.getpid()}
+        lines = "".join(json.dumps({**meta, **record}) + "\n" for record in run["records"])
+        with _log_lock:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+    return run["records"]
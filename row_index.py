@@ -0,0 +1,48 @@
+"""Bitmap indexes behind the sidebar filters.
+
+An index holds, for every value of every filter dimension, a packed bitmap
+(np.packbits, one bit per row) of the rows that have it. A selection ORs the
+bitmaps of the chosen values within a dimension and ANDs the dimensions
+together, all on packed bytes, then unpacks the result into sorted row ids
+once. Selecting over 1.7M rows touches about 210 KB per bitmap instead of
+comparing every row of every filtered column.
+
+The same index works over data rows and over cube cells: cube.py keeps all
+of FILTER_DIMS as dimensions, so filtering a cube selects its cells.
+"""
+import numpy as np
+
+FILTER_DIMS = ["yr", "season", "weathersit", "holiday", "workingday"]
+
+
+def build(df, dims=FILTER_DIMS):
+    bitmaps = {}
+    for dim in dims:
+        codes = df[dim].to_numpy()
+        bitmaps[dim] = {int(value): np.packbits(codes == value) for value in np.unique(codes)}
+    return {"rows": len(df), "bitmaps": bitmaps}
+
+
+def select(index, selections):
+    """Sorted row ids matching `selections`, or None when nothing is filtered out.
+
+    Values an index has never seen match no rows; a dimension left out of
+    `selections` does not filter.
+    """
+    mask = None
+    for dim, allowed in selections.items():
+        bitmaps = index["bitmaps"][dim]
+        if set(bitmaps) <= set(allowed):
+            continue
+        chosen = np.zeros((index["rows"] + 7) // 8, dtype=np.uint8)
+        for value in allowed:
+            if value in bitmaps:
+                chosen |= bitmaps[value]
+        mask = chosen if mask is None else mask & chosen
+    if mask is None:
+        return None
+    return np.flatnonzero(np.unpackbits(mask, count=index["rows"]))
+
+
+def take(df, row_ids):
+    return df if row_ids is None else df.iloc[row_ids]
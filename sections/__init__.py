@@ -0,0 +1,12 @@
+"""The pages of the data story, one module per page with a `render()` function."""
+
+# (title, module, url path) in story order; app.py and snapshot.py both
+# build their navigation from this list
+PAGES = [
+    ("Introduction", "introduction", "introduction"),
+    ("Rhythm of Ridership", "rhythm", "rhythm_of_ridership"),
+    ("Weather", "weather", "weather"),
+    ("Casual vs Registered", "riders", "casual_vs_registered"),
+    ("Predictive Modelling", "modelling", "predictive_modelling"),
+    ("Conclusions", "conclusions", "conclusions"),
+]
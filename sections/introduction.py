@@ -0,0 +1,21 @@
+"""Introduction, objectives, dataset and methodology of the data story."""
+import streamlit as st
+
+
+def render():
+    st.subheader("Introduction")
+    st.markdown("As cities continue to grow and shift towards sustainable transportation, bike-sharing systems have emerged as a crucial component of urban mobility. They provide a flexible, eco-friendly, and cost-effective means of transportation for daily commuters, recreational riders, and tourists alike. However, understanding when and how these bike-sharing systems are utilized is essential for optimizing station locations, adjusting bike availability, and improving overall service efficiency. In this data story, we analyze the UCI Bike Sharing Dataset, which contains detailed records of bike rental activity in Washington, D.C., collected over two years (2011-2012). This dataset provides valuable insights into hourly and daily rental patterns, influenced by factors such as time of day, day of the week, seasonality, and weather conditions. By leveraging visual analytics, we explore how different user behaviors emerge based on commuting patterns, weekday vs. weekend usage, and impact of weather conditions, time of day, seasonal variations, and user behavior.")
+
+    st.subheader("Objectives")
+    st.markdown("Through our analysis, we aim to answer key questions about bike-sharing trends: How do rental patterns fluctuate across different timescales? Are there noticeable variations between weekdays and weekends? How do external factors like weather, temperature, and wind speed shape bike-sharing demand? How do rental behaviors differ between registered users and casual riders? By addressing these questions, we seek to uncover actionable insights that can help urban planners, policymakers, and bike-sharing companies optimize service availability, improve user experience, and better accommodate evolving urban mobility needs.")
+
+    st.subheader("Dataset")
+    st.markdown("The dataset provides detailed records of bike-sharing rentals in Washington, D.C., including temporal attributes such as date, year, month, hour, day of the week, and holiday/workday status, as well as weather conditions like temperature, humidity, wind speed, and general weather. It also includes user information, distinguishing between casual and registered users, along with total bike rentals. Two primary files were analyzed: hour.csv, which contains hourly bike rental data with 17,379 records, and day.csv, which includes daily bike rental data with 731 records.")
+
+    st.subheader("Methodology")
+    st.markdown("**Visualizations**")
+    st.markdown("Several interactive visualizations were created using Plotly and Streamlit to better understand bike rental trends. The impact of temperature, humidity, and wind speed on rentals under different weather conditions was analyzed using facet-based scatter plots, ensuring proper layout adjustments for clarity. Additionally, stacked bar charts were employed to examine seasonal preferences among casual vs. registered riders. All plots were integrated into a Streamlit dashboard, allowing interactive exploration of rental patterns.")
+    st.markdown("**Predictive Modeling of Bike Rentals**")
+    st.markdown("The predictive modeling process was designed to forecast bike rental demand based on various environmental and temporal features. The dataset was first preprocessed, including handling missing values, encoding categorical variables, and ensuring numerical consistency. A train-test split (80-20) was performed to allow robust model evaluation. Multiple regression models were implemented, including Linear Regression, Ridge, Lasso, ElasticNet, Bayesian Ridge, Huber, Decision Trees, Random Forest, Gradient Boosting, XGBoost, and k-Nearest Neighbors. Each model was evaluated based on Mean Squared Error (MSE) and R² scores to assess performance. Hyperparameter tuning using a successive-halving grid search was conducted for selected models like Random Forest, Gradient Boosting, and Decision Trees to optimize predictive accuracy. The best model’s feature importance was analyzed using the Gradient Boosting Regressor, revealing which factors most influenced bike rental trends. Finally, the results were visualized in Streamlit, allowing users to compare model performance and explore feature significance interactively.")
+    st.markdown("**Predictive Modeling for Clustering-Based Demand Classification**")
+    st.markdown("A separate approach was taken to cluster rental demand patterns based on environmental conditions, particularly temperature and humidity. The dataset underwent feature scaling using StandardScaler to normalize values before applying KMeans clustering with three clusters: Low Demand, Medium Demand, and High Demand. The clustering results were assigned labels, to provide a more intuitive understanding of demand segmentation. To further explore the demand structure, a scatter plot was generated to visualize bike rental demand based on temperature, with colors representing different demand clusters. Additionally, a k-Nearest Neighbors (KNN) model was prepared for future classification tasks to determine how well the temperature-humidity combination predicts rental demand levels. The visualization was implemented using Plotly and Streamlit, offering an interactive way to explore how weather conditions influence rental demand patterns.")
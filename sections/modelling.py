@@ -0,0 +1,215 @@
+"""Part 4. Unlocking Insights with Predictive Modelling.
+
+This is the only section that needs scikit-learn and xgboost, so they are
+imported here rather than in app.py: the import cost is paid the first time
+a reader opens this section.
+"""
+import pandas as pd
+import streamlit as st
+
+import profiler
+
+# Timed on the run that first opens this section; later imports are free
+with profiler.stage("import sklearn"):
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, ExtraTreesRegressor
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet, BayesianRidge, HuberRegressor
+    from sklearn.model_selection import train_test_split
+    from sklearn.neighbors import KNeighborsRegressor
+    from sklearn.svm import SVR
+    from sklearn.tree import DecisionTreeRegressor
+with profiler.stage("import xgboost"):
+    from xgboost import XGBRegressor
+
+import data_cache
+import evaluation
+import figure_cache
+import figures
+import forecasting
+import hyperparam_search
+import jobs
+import model_store
+import segmentation
+import streaming
+import training
+from story_data import (cached_figure, load_data, load_features, load_forecast_features,
+                        load_segmentation, model_fingerprint, show_downsample_caption, show_model_data_caption,
+                        show_sample_caption)
+
+
+def _retry_button(container, job):
+    # A failed job stays failed (and is not refitted by every rerun) until asked again
+    if container.button("Retry", key=f"retry {job.key}"):
+        jobs.retry(job.key)
+        st.rerun()
+
+
+def _show_progress(container, job, finished, total):
+    if job.error:
+        container.error(f"Background job failed: {job.error}")
+        _retry_button(container, job)
+    elif job.status == "queued":
+        container.caption("Queued behind other background jobs; results appear as they finish.")
+    elif not job.done:
+        container.caption(f"Running in the background: {finished} of {total} done after {job.elapsed():.0f} s. "
+                          "Results appear as they finish and are shared with every viewer.")
+
+
+def _forecast_job(inputs, data_digest, on_result):
+    # One model per horizon, reported as each one finishes
+    for horizon, (X_lagged, y_lagged, train_rows, test_rows, naive) in inputs.items():
+        on_result(f"t+{horizon}h", forecasting.evaluate(X_lagged, y_lagged, train_rows, test_rows,
+                                                        naive, horizon, data_digest))
+
+
+def _tuning_job(X_train, y_train, X_test, y_test, data_digest, on_result):
+    # Successive-halving search (resumed from the on-disk trial log), then the tuned fit
+    best_trials = hyperparam_search.run_search(X_train, y_train, data_digest)
+    on_result("search", best_trials)
+    gb_model = GradientBoostingRegressor(**best_trials["Gradient Boosting"]["params"], random_state=42)
+    entry = model_store.fit_or_load("Tuned Gradient Boosting", gb_model,
+                                    X_train, y_train, X_test, y_test, data_digest)
+    return best_trials, entry["model"]
+
+
+def render():
+    day_df, hour_df = load_data()
+
+    st.subheader("Part 4. Unlocking Insights with Predictive Modelling – Forecasting Bike Rental Demand")
+    show_sample_caption()
+    #############################################################
+
+    # VISUALIZATION 15: Predictive Modeling 1 - Bike Rental Predictions
+    st.markdown("<h4>4A. Predictive Modeling - Bike Rental Predictions</h4>", unsafe_allow_html=True)
+    # Features: temp, hum, windspeed, hr, holiday and one-hot weekday and
+    # weathersit, encoded once per version of the training rows by the frozen
+    # encoder that predict.py scores new scenarios with
+    _, X, y = load_features()
+    show_model_data_caption()
+    # Train-Test Split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # **Train Multiple Models**
+    models = {
+        "Linear Regression": LinearRegression(),
+        "Ridge Regression": Ridge(alpha=1.0),
+        "Lasso Regression": Lasso(alpha=1.0),
+        "ElasticNet Regression": ElasticNet(alpha=1.0, l1_ratio=0.5),
+        "Bayesian Ridge Regression": BayesianRidge(),
+        "Huber Regression": HuberRegressor(),
+        "Random Forest Regression": RandomForestRegressor(n_estimators=100),
+        "Decision Tree Regression": DecisionTreeRegressor(max_depth=5),
+        "Gradient Boosting Regression": GradientBoostingRegressor(n_estimators=100, learning_rate=0.1, max_depth=3),
+        "Support Vector Regression": SVR(kernel='rbf'),
+        "K-Nearest Neighbors": KNeighborsRegressor(n_neighbors=5),
+        "XGBoost": XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=3),
+        "Extra Trees Regression": ExtraTreesRegressor(n_estimators=100)}
+    # The slow fits run as background jobs shared by every session (fitted models are
+    # reused from the on-disk model store); the tables fill in as results arrive
+    data_digest = data_cache.file_digest("hour.csv")
+    run_key = (model_fingerprint(), model_store.split_digest(X_train, X_test))
+    train_job = jobs.submit(("model comparison", *run_key), training.train_models,
+                            models, X_train, y_train, X_test, y_test, data_digest)
+    part4_jobs = [train_job]
+    if not streaming.ENABLED:
+        forecast_inputs = {horizon: load_forecast_features(horizon) for horizon in forecasting.HORIZONS}
+        forecast_job = jobs.submit(("forecasts", model_fingerprint()), _forecast_job, forecast_inputs, data_digest)
+        part4_jobs.append(forecast_job)
+    tuning_job = jobs.submit(("tuning", *run_key), _tuning_job, X_train, y_train, X_test, y_test, data_digest)
+    part4_jobs.append(tuning_job)
+    running = not all(job.done for job in part4_jobs)
+
+    st.markdown("<h4>Model Performance Comparison</h4>", unsafe_allow_html=True)
+    #st.subheader("Model Performance Comparison")
+
+    @st.fragment(run_every=jobs.POLL_SECONDS if running else None)
+    def comparison_tables():
+        models_col, forecast_col = st.columns([3, 2])
+        results = train_job.result or train_job.partial()
+        # Keep the order of `models` while fits finish out of order
+        results_df = pd.DataFrame(results).T.reindex([n for n in models if n in results])
+        models_col.dataframe(results_df)
+        _show_progress(models_col, train_job, len(results), len(models))
+        # **Forecasts with lag features** (cnt at t-1/t-24/t-168 and trailing means, one model per
+        # horizon, trained on the earlier hours and tested on the latest ones)
+        with forecast_col:
+            st.markdown("**Forecasts with lag features (chronological split)**")
+            if streaming.ENABLED:
+                st.caption("Lag features need the full hourly series, which streaming mode does not keep.")
+            else:
+                forecasts = forecast_job.partial()
+                st.dataframe(pd.DataFrame(forecasts).T)
+                _show_progress(st, forecast_job, len(forecasts), len(forecasting.HORIZONS))
+        # Once the jobs running when the page was drawn are all in, rerun the page so the
+        # sections below can use them; finished or failed jobs do not trigger it again
+        if running and all(job.done for job in part4_jobs):
+            st.rerun()
+    comparison_tables()
+
+    # **Cross-Validated Comparison** (mean ± 95% CI over folds, with fit/predict cost; folds are logged on disk)
+    st.markdown("<h4>Cross-Validated Model Comparison</h4>", unsafe_allow_html=True)
+    cv_scheme_col, cv_folds_col = st.columns(2)
+    cv_scheme = cv_scheme_col.radio("CV scheme", evaluation.SCHEMES, horizontal=True,
+                                    help="'time series' trains on earlier hours and tests on the block that follows.")
+    cv_folds = cv_folds_col.slider("Folds", min_value=3, max_value=10, value=evaluation.CV_FOLDS)
+    if st.checkbox("Run cross-validation", help="Fits every model once per fold; finished folds are reused."):
+        cv_job = jobs.submit(("cross-validation", cv_scheme, cv_folds, model_fingerprint()), evaluation.evaluate_models,
+                             models, X, y, data_digest, scheme=cv_scheme, folds=cv_folds)
+        cv_running = not cv_job.done
+
+        @st.fragment(run_every=jobs.POLL_SECONDS if cv_running else None)
+        def cv_table():
+            cv_results = cv_job.result or cv_job.partial()
+            st.dataframe(pd.DataFrame(cv_results).T.reindex([n for n in models if n in cv_results]))
+            _show_progress(st, cv_job, len(cv_results), len(models))
+            if cv_running and cv_job.done:
+                st.rerun()
+        cv_table()
+
+    # **Grid Search Results** (successive halving, resumed from the on-disk trial log)
+    st.markdown("<h4>Grid Search Results - Best Model Parameters & R² Scores</h4>", unsafe_allow_html=True)
+    #st.subheader("Grid Search Results - Best Model Parameters & R² Scores")
+    if not tuning_job.done:
+        st.info("The hyperparameter search and the tuned Gradient Boosting fit are running in the background; "
+                "this section and the feature importance fill in when they finish.")
+    elif tuning_job.error:
+        st.error(f"Hyperparameter search failed: {tuning_job.error}")
+        _retry_button(st, tuning_job)
+    else:
+        best_trials, gb_model = tuning_job.result
+        st.dataframe(hyperparam_search.results_table(best_trials))
+        # **Feature Importance using Gradient Boosting Regressor**
+        st.markdown("<h4>Feature Importance - Gradient Boosting Regressor</h4>", unsafe_allow_html=True)
+        #st.subheader("Feature Importance - Gradient Boosting Regressor")
+        best_params = best_trials["Gradient Boosting"]["params"]
+        # Extract Feature Importance
+        feature_importance_df = pd.DataFrame({
+            "Feature": X.columns,
+            "Importance": gb_model.feature_importances_})
+        # Bar chart for feature importance (keyed by the tuned parameters it was trained with)
+        with profiler.stage("figure: feature_importance"):
+            fig = figure_cache.get(figures.feature_importance, f"{model_fingerprint()}:{best_params}",
+                                   feature_importance_df)
+        st.plotly_chart(fig, use_container_width=True)
+    st.markdown("**Analysis**: Based on the results of the comparative table, it can be observed that that Gradient Boosting Regression is the most effective model for predicting bike rental demand, with an R² score of 0.8469. Hour of the day emerged as the most critical factor, reflecting peak rental times during commuting hours. Temperature and weekday trends also significantly influenced demand, with higher rentals on warm days and workdays showing distinct peaks. Adverse weather conditions such as rain and snow were found to reduce rentals considerably. The presence of holidays showed varied effects on demand, with some seasonal variations. These insights suggest that bike-sharing systems can optimize availability by reallocating bikes dynamically during peak hours, adjusting pricing strategies based on weather conditions, and implementing targeted promotions to increase ridership during weekends and holidays. Ultimately, machine learning models offer a robust approach to forecasting demand, aiding both urban mobility planners and bike-sharing companies in improving operational efficiency and customer satisfaction.")
+
+    #############################################################
+
+    # VISUALIZATION 16: Predictive Modeling 2 - KNN CLUSTERING (ANIKA)
+    st.markdown("<h4>4B. Predictive Modeling - Clustering-Based Demand Classification</h4>", unsafe_allow_html=True)
+
+    # Demand segments on standardized temp, hum, windspeed, season, weekday,
+    # workingday and weathersit. Segments are ranked on their mean rentals, so
+    # the Low/Medium/High labels always land on the right cluster
+    granularity = st.radio("Cluster", ["Days", "Hours"], horizontal=True,
+                           help="Hours cluster every hourly row; large inputs switch to mini-batch k-means.")
+    segment_df = day_df if granularity == "Days" else hour_df
+    with profiler.stage("segmentation"):
+        segments = load_segmentation(granularity)
+        # Cluster labels go on a copy so the shared frames stay unchanged
+        cluster_df = segment_df.assign(demand_cluster=segmentation.assign(segments, segment_df))
+    cluster_df["demand_category"] = segmentation.labels(segments, cluster_df["demand_cluster"])
+
+    fig_scatter = cached_figure(figures.demand_scatter, cluster_df, source="day" if granularity == "Days" else "hour",
+                                 granularity=granularity)
+    st.plotly_chart(fig_scatter, use_container_width=True)
+    show_downsample_caption(fig_scatter)
+    st.markdown("**Analysis**: The scatter plot presents a K-Means clustering-based demand classification for bike rentals, categorized into Low, Medium, and High Demand clusters based on temperature. The trend suggests a strong positive correlation between temperature and total bike rentals. The low-demand cluster (red) is concentrated at lower temperatures, indicating that cold weather significantly reduces ridership. The medium-demand cluster (blue) appears to be more spread out, covering moderate temperatures where bike rentals fluctuate. The high-demand cluster (green) emerges at higher temperatures, confirming that warmer weather attracts more bike riders. This clustering analysis reinforces the idea that temperature plays a critical role in determining demand for bike rentals. Warmer temperatures likely make cycling more comfortable and appealing, while colder conditions deter casual riders. The presence of medium demand in some mid-range temperatures suggests that other factors, such as humidity or wind speed, may also influence ridership patterns. These insights can help bike-sharing programs optimize fleet distribution, ensuring more bikes are available during peak demand seasons while reducing excess supply in colder months.")
@@ -0,0 +1,62 @@
+"""Part 1. The Rhythm of Ridership: When Do People Ride?"""
+import streamlit as st
+
+import figures
+from story_data import cached_figure, load_cubes, load_data, show_filters
+
+
+def render():
+    filters = show_filters()
+    # The hourly charts read the cube, so only the daily rows are needed
+    day_df, = load_data(filters, tables=("day",))
+    day_cube, hour_cube = load_cubes(filters)
+
+    st.subheader("Part 1. The Rhythm of Ridership: When Do People Ride?")
+    #############################################################
+    # VISUALIZATION 1: Bike Usage Across Different Seasons
+    st.markdown("<h4>1A. How does bike usage vary across different seasons?</h4>", unsafe_allow_html=True)
+    fig_season_box = cached_figure(figures.season_box, day_df, source="day", filters=filters)
+    st.plotly_chart(fig_season_box)
+    st.markdown("**Analysis**: The box plot illustrating bike rentals across seasons reveals the presence of clear seasonal trends in bike rentals, with significantly higher usage during warmer months (Spring and Summer seasons) and lower usage in colder seasons (Winter and Fall). Spring and Summer show the highest median rentals, exceeding 4000, with a wide range of variability, suggesting that factors like weather conditions and special events influence demand. Contrastingly, Winter has the lowest median rentals, around 2000, with some days experiencing near-zero usage, which may be due to typical harsh weather conditions that occur during the Winter months. Fall exhibits moderate bike usage, but with a few extreme outliers. The variability in Summer and Spring highlights fluctuating demand, while Winter and Fall rentals are more consistent but lower overall. This analysis underscores the strong influence of seasonality on bike rentals, indicating that bike-sharing programs should optimize bike availability based on seasonal trends to maximize efficiency and rider satisfaction.")
+
+    #############################################################
+    # VISUALIZATION 2: Long-term Trends in Bike Usage
+    st.markdown("<h4>1B. What are the long-term trends in bike usage over the years?</h4>", unsafe_allow_html=True)
+    fig_trend = cached_figure(figures.trend, day_df, source="day", filters=filters)
+    st.plotly_chart(fig_trend)
+    st.markdown("**Analysis**: The time series plot shows clear long-term trends in bike usage, with strong seasonal patterns and overall fluctuations in bike rentals. There is an evident increase in bike rentals starting in early 2011, reaching peaks during the warmer months and declining in the winter, a pattern that repeats across multiple years. The highest usage is observed in mid-2012, which might be explained by either increased adoption of bike-sharing programs or favorable weather and infrastructure improvements. However, there is a visible decline in ridership toward the end of 2012 and into early 2013, likely due to seasonal effects rather than a long-term downward trend. These fluctuations indicate that while ridership has generally grown, external factors such as weather, policy changes, and infrastructure development may influence the consistency of bike usage over time.")
+
+    #############################################################
+
+    # VISUALIZATION 3: Hourly Bike Demand Across Days of the Week
+    st.markdown("<h4>1C. How does bike demand fluctuate throughout the day?</h4>", unsafe_allow_html=True)
+    fig_hourly_animated = cached_figure(figures.hourly_animated, hour_cube, source="hour", filters=filters)
+    st.plotly_chart(fig_hourly_animated, use_container_width=True)
+    st.markdown("**Analysis**: The interactive bar chart provides a detailed view of hourly bike demand across different days of the week, offering insights into how usage patterns vary between weekdays and weekends. On weekdays (Monday to Friday), there are two distinct peaks in bike rentals: one in the morning between 7-9 AM and another in the evening between 4-7 PM. These trends indicate that a significant portion of users rely on bike-sharing services for commuting to work or school. In contrast, weekends (Saturday and Sunday) exhibit a more gradual increase in demand throughout the day, with peak usage occurring later in the morning and early afternoon, around 10 AM - 6 PM. This suggests a shift from structured commuting-based rentals to recreational or leisurely bike rides. Late-night and early-morning bike rentals remain consistently low across all days, with minimal activity between 12 AM and 5 AM, indicating limited demand during these hours. However, weekend nights show slightly higher late-night rentals, likely due to social outings or nightlife activities. Additionally, Fridays stand out as a transitional day, displaying characteristics of both weekday commuting behavior and increasing evening leisure activity. Unlike other weekdays, Friday’s evening peak extends later into the night, reflecting a gradual shift into weekend patterns. Overall, this visualization highlights the clear distinction between weekday and weekend bike rental behaviors. Weekdays are characterized by structured demand tied to work and school schedules, while weekends cater more to flexible, leisure-oriented biking.")
+
+    #############################################################
+    # VISUALIZATION 4: Bike Usage Trends Over the Week
+    st.markdown("<h4>1D. Are there noticeable weekly trends in bike usage?</h4>", unsafe_allow_html=True)
+    fig_weekly_trends_line = cached_figure(figures.weekly_trends_line, day_cube, source="day", filters=filters)
+    st.plotly_chart(fig_weekly_trends_line)
+
+    #############################################################
+    # VISUALIZATION 5: Distribution of Bike Rentals Across the Week
+
+    fig_weekly_trends_box = cached_figure(figures.weekly_trends_box, day_df, source="day", filters=filters)
+    st.plotly_chart(fig_weekly_trends_box, use_container_width=True)
+    st.markdown("**Analysis**: The line chart shows a gradual increase in bike rentals from Sunday to Friday, with a peak on Thursday and Friday, before dropping slightly on Saturday. This suggests that bike usage is highest during the weekdays, likely driven by commuters using bikes for work or school. The slight decline on weekends could indicate that fewer people are commuting, although there is still significant bike usage. The box plot complements this by showing the distribution and variability of bike rentals for each day. It reveals that while weekdays generally have higher median rentals, the spread is also greater, suggesting higher fluctuations in demand. This could be due to variations in weather, events, or different commuting patterns. Interestingly, weekend rentals have a wider range, indicating some days see substantial usage spikes, possibly due to recreational activities. Together, these two visuals suggest that bike rentals are primarily driven by weekday commuting patterns, but weekends still see significant usage, albeit with more variability. ")
+
+    #############################################################
+    # VISUALIZATION 6: Holiday and Workday Trends in Ridership
+    st.markdown("<h4>1E. How do bike rental patterns differ between workdays and holidays throughout the day?</h4>", unsafe_allow_html=True)
+    fig_hourly_rentals = cached_figure(figures.hourly_rentals, hour_cube, source="hour", filters=filters)
+    st.plotly_chart(fig_hourly_rentals, use_container_width=True)
+    st.markdown("**Analysis**: The line chart highlights key differences in bike rental patterns between workdays and holidays. On workdays, rentals peak sharply around 8 AM and 5-6 PM, aligning with commuting hours, indicating that many users rely on bike-sharing for work or school travel. In contrast, holiday rentals are more evenly distributed throughout the day, suggesting that usage is more recreational. Overall, rentals are higher on workdays, especially during peak hours, reinforcing the role of bike-sharing in daily commutes. These insights can help optimize bike availability, ensuring sufficient supply during peak commuting hours while maintaining balanced distribution for recreational riders on holidays.")
+
+    #############################################################
+    # VISUALIZATION 7: Hourly Bike Rental Trends Across Months
+    st.markdown("<h4>1F. How does bike rental demand fluctuate across different months of the year? Are there noticeable seasonal patterns in hourly usage?</h4>", unsafe_allow_html=True)
+    fig_facet_interactive = cached_figure(figures.facet_interactive, hour_cube, source="hour", filters=filters)
+    st.plotly_chart(fig_facet_interactive)
+    st.markdown("**Analysis**: This visualization reveals distinct seasonal patterns in bike rental demand. Warmer months, particularly May through September, exhibit significantly higher peaks, especially in the afternoon and evening, suggesting increased recreational and leisure usage. Conversely, colder months (November to February) show lower overall rentals, likely due to unfavorable weather conditions. A consistent two-peak pattern emerges across most months, with demand surging around 8 AM and 5-6 PM, aligning with typical commuting hours. However, during summer months (June–August), the afternoon peak is notably higher, indicating that more people are renting bikes for activities beyond commuting. Additionally, July and August experience the highest rental volumes, while December and January see the lowest, further emphasizing the correlation between temperature, daylight hours, and biking behavior. Another key insight is that during warmer months, usage remains sustained throughout the day, while in colder months, demand is concentrated primarily around peak commute times. These findings suggest that bike rental usage is strongly season-dependent, with warmer months encouraging more widespread and extended use beyond essential travel needs.")
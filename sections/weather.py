@@ -0,0 +1,70 @@
+"""Part 2. Riding with the Weather: What Influences Bike Demand?"""
+import streamlit as st
+
+import downsample
+import figures
+import heatmap
+from story_data import (cached_figure, load_data, load_heatmap_grid, show_downsample_caption, show_filters,
+                        show_sample_caption)
+
+
+def render():
+    filters = show_filters()
+    day_df, hour_df = load_data(filters)
+
+    # Large scatter plots are thinned on the server above a row threshold
+    st.sidebar.markdown("**Scatter rendering**")
+    scatter_mode = st.sidebar.selectbox(
+        "Mode", downsample.MODES,
+        help=f"'auto' draws every point below {downsample.SCATTER_THRESHOLD:,} rows and a stratified sample above it.")
+    point_budget = st.sidebar.number_input("Point budget", min_value=100, max_value=50000,
+                                           value=downsample.POINT_BUDGET, step=500)
+
+    st.subheader("Part 2. Riding with the Weather: What Influences Bike Demand?")
+    show_sample_caption()
+    #############################################################
+    # VISUALIZATION 8: Impact of Temperature on Bike Rentals
+    st.markdown("<h4>2A. What is the impact of temperature on bike rentals? (e.g., is there an optimal temperature for bike rentals?)</h4>", unsafe_allow_html=True)
+    fig_temp = cached_figure(figures.temp_scatter, day_df, mode=scatter_mode, budget=point_budget,
+                             source="day", filters=filters)
+    st.plotly_chart(fig_temp)
+    show_downsample_caption(fig_temp)
+    st.markdown("**Analysis**: The scatter plot shown above demonstrates a clear positive correlation between temperature and bike rentals, indicating that warmer temperatures generally lead to higher bike usage. At lower normalized temperatures (around 0.2), bike rentals remain relatively low, suggesting that colder conditions discourage ridership. As temperature increases, the number of rentals rises steadily, peaking at moderate to high normalized temperatures (between 0.6 and 0.8), where total bike rentals frequently exceed 6000. However, at the highest temperature levels, there appears to be a slight plateau, suggesting that extreme heat may not necessarily lead to increased ridership and could even discourage some users. This pattern implies that there is an optimal temperature range for bike rentals, likely in mild to warm conditions, beyond which extreme heat may act as a deterrent. Understanding this relationship between temperature and bike rentals, can aid city planners and bike-sharing programs optimize operations by ensuring adequate bike availability during peak temperature conditions while also considering the potential impact of extreme weather.")
+
+    #############################################################
+    # VISUALIZATION 9: Impact of Humidity on Bike Rentals
+    st.markdown("<h4>2B. How does humidity influence bike rental demand?</h4>", unsafe_allow_html=True)
+    fig_humidity = cached_figure(figures.humidity_scatter, day_df, mode=scatter_mode, budget=point_budget,
+                                 source="day", filters=filters)
+    st.plotly_chart(fig_humidity)
+    show_downsample_caption(fig_humidity)
+    st.markdown("**Analysis**: The scatter plot illustrates the relationship between humidity and bike rental demand, showing a weak but noticeable trend. At lower humidity levels (below 0.4), bike rentals vary widely but tend to be lower on average, with fewer instances of peak usage. As humidity increases, rental counts remain relatively stable, suggesting that moderate humidity does not significantly impact ridership. However, at very high humidity levels (above 0.8), bike rentals appear to slightly decline, indicating that extreme humidity may discourage biking due to discomfort or unfavorable weather conditions such as heavy moisture or rain. While humidity does not exhibit a strong linear relationship with bike rentals, there may be an optimal mid-range where ridership is less affected, whereas extreme conditions—either too dry or too humid—might contribute to decreased demand.")
+
+    #############################################################
+    # VISUALIZATION 10: Are bike rentals more affected by temperature or humidity?
+    st.markdown("<h4>2C. Are bike rentals more affected by temperature or humidity?</h4>", unsafe_allow_html=True)
+    # Any resolution is summed from the cached fine grid, without rescanning rows
+    x_col, y_col, res_col = st.columns(3)
+    heatmap_x = x_col.selectbox("Rows", ["temp", "atemp"], format_func=lambda c: figures.WEATHER_AXES[c][0])
+    heatmap_y = y_col.selectbox("Columns", ["hum", "windspeed"], format_func=lambda c: figures.WEATHER_AXES[c][0])
+    heatmap_bins = res_col.slider("Resolution (bins)", min_value=4, max_value=40, value=heatmap.DEFAULT_BINS)
+    fig_heatmap = cached_figure(figures.weather_heatmap, load_heatmap_grid(heatmap_x, heatmap_y, filters),
+                                x=heatmap_x, y=heatmap_y, bins=heatmap_bins, source="hour", filters=filters)
+    st.plotly_chart(fig_heatmap, use_container_width=True)
+    st.markdown("**Analysis**: A clear trend of interaction between temperature, humidity, and bike rentals, emerges from the heatmap. The intensity of rentals is higher in mid to high-range temperatures (0.5 - 0.9 normalized scale), where demand increases significantly. The most significant observation is the sharp increase in bike rentals when temperatures are at their peak, suggesting that warmer weather encourages higher ridership. In contrast, humidity exhibits a more gradual and less pronounced effect on rentals. While extreme humidity levels (both low and high) seem to slightly suppress demand, bike rentals remain relatively stable across most humidity ranges. This suggests that while riders may be slightly deterred by excessive humidity, temperature plays a far greater role in influencing ridership patterns. The brightest yellow sections (indicating the highest rental volumes) align with warmer temperatures rather than specific humidity levels. This reinforces the idea that bike-sharing systems should prioritize temperature forecasts over humidity when optimizing fleet distribution and availability.")
+
+    #############################################################
+    # VISUALIZATION 11: What are the effects of wind speed on bike usage?
+    st.markdown("<h4>2D. What are the effects of wind speed on bike usage?</h4>", unsafe_allow_html=True)
+    fig_wind1 = cached_figure(figures.wind_scatter, hour_df, mode=scatter_mode, budget=point_budget,
+                              source="hour", filters=filters)
+    st.plotly_chart(fig_wind1, use_container_width=True)
+    show_downsample_caption(fig_wind1)
+    st.markdown("**Analysis**: The scatter plot reveals an interesting insight: wind speed has a relatively weak impact on total bike rentals. The density of high-rental points remains fairly consistent across lower wind speeds (0.0 - 0.5 normalized scale), suggesting that most riders are not significantly discouraged by mild to moderate wind conditions. However, as wind speed increases beyond 0.5 normalized scale, rental numbers begin to decline, with fewer instances of high usage. This trend indicates that while riders may tolerate light winds, stronger winds likely dissuade potential users, reducing ridership. The bright yellow clusters are concentrated in low-wind conditions, suggesting that bike-sharing programs should account for high-wind days when predicting demand. Although wind speed is not as influential as temperature, extreme wind conditions could warrant strategic bike redistribution to areas with more shelter or alternative transport options.")
+
+    #############################################################
+    # VISUALIZATION 12: How does different weather conditions (e.g., clear, misty, rainy) affect ridership?
+    st.markdown("<h4>2E. How does different weather conditions (e.g., clear, misty, rainy) affect ridership?</h4>", unsafe_allow_html=True)
+    fig_weather = cached_figure(figures.weather_box, hour_df, source="hour", filters=filters)
+    st.plotly_chart(fig_weather, use_container_width=True)
+    st.markdown("**Analysis**: Weather plays a crucial role in shaping bike-sharing patterns, as seen in the visualizations above. Clear weather consistently sees the highest ridership, with a wide range of total rentals. This suggests that more users are comfortable cycling in favorable conditions. As conditions shift to misty/ cloudy or light rain/ snow, the median number of rentals declines, and variability narrows, indicating fewer peak usage days. However, ridership remains relatively stable, suggesting that moderate weather changes do not completely deter riders. In heavy rain/ ice pellets/ thunderstorms, bike rentals drop significantly. The box plot reveals a much lower median with minimal variation, and scatter plots show very few high-rental points under these conditions. This suggests that extreme weather acts as a strong deterrent, reducing overall riders. For bike-sharing operators, this means optimizing fleet distribution on clear days to accommodate higher demand while considering alternative transportation incentives or service modifications during severe weather.")
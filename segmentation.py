@@ -0,0 +1,96 @@
+"""Demand segmentation behind Visualization 16.
+
+Rows (days or hours) are clustered on their standardized weather and
+calendar features. Up to EXACT_MAX_ROWS rows use KMeans with ten k-means++
+restarts. Above that, a k-means++ fit on a sample seeds MiniBatchKMeans
+over all rows, so hourly or multi-city data does not stall the page.
+
+Cluster ids are ranked by the mean `cnt` of their members, lowest first, so
+id 0 is always "Low Demand" whatever order the fit produced. A model is a
+plain dict of scaler, centroids and per-cluster row counts and `cnt` sums.
+`assign` labels new rows with a vectorized nearest-centroid lookup, and
+`update` folds new rows in with a mini-batch k-means step.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+FEATURES = ["temp", "hum", "windspeed", "season", "weekday", "workingday", "weathersit"]
+CLUSTER_COUNT = 3
+DEMAND_LABELS = ["Low Demand", "Medium Demand", "High Demand"]
+EXACT_MAX_ROWS = int(os.environ.get("BIKE_EXACT_CLUSTER_ROWS", 20_000))
+INIT_SAMPLE_ROWS = 10_000
+BATCH_SIZE = 4096
+
+
+def _standardize(model, df):
+    return (df[FEATURES].to_numpy(dtype=np.float64) - model["mean"]) / model["scale"]
+
+
+def _ranked(model):
+    # Lowest mean cnt first; empty clusters sort last
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_cnt = np.where(model["counts"] > 0, model["cnt_sums"] / model["counts"], np.inf)
+    order = np.argsort(mean_cnt, kind="stable")
+    return {**model, "centroids": model["centroids"][order], "counts": model["counts"][order],
+            "cnt_sums": model["cnt_sums"][order]}
+
+
+def _nearest(X, centroids):
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2; |x|^2 is the same for every centroid
+    return (centroids ** 2).sum(axis=1)[None, :] - 2 * X @ centroids.T
+
+
+def fit(df, k=CLUSTER_COUNT, mode="auto", seed=42):
+    """Cluster the rows of `df`; `mode` is "exact", "fast" or "auto" (by row count)."""
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    values = df[FEATURES].to_numpy(dtype=np.float64)
+    scale = values.std(axis=0)
+    model = {"mean": values.mean(axis=0), "scale": np.where(scale > 0, scale, 1.0)}
+    X = _standardize(model, df)
+    if mode == "auto":
+        mode = "exact" if len(df) <= EXACT_MAX_ROWS else "fast"
+    if mode == "exact":
+        centroids = KMeans(n_clusters=k, random_state=seed, n_init=10).fit(X).cluster_centers_
+    else:
+        rng = np.random.default_rng(seed)
+        sample = X[rng.choice(len(X), min(len(X), INIT_SAMPLE_ROWS), replace=False)]
+        init = KMeans(n_clusters=k, random_state=seed, n_init=3).fit(sample).cluster_centers_
+        centroids = MiniBatchKMeans(n_clusters=k, init=init, n_init=1, batch_size=BATCH_SIZE,
+                                    random_state=seed).fit(X).cluster_centers_
+    ids = _nearest(X, centroids).argmin(axis=1)
+    return _ranked({**model, "mode": mode, "centroids": centroids,
+                    "counts": np.bincount(ids, minlength=k),
+                    "cnt_sums": np.bincount(ids, weights=df["cnt"].to_numpy(dtype=np.float64), minlength=k)})
+
+
+def assign(model, df):
+    """Cluster id (0 = lowest demand) of every row of `df`."""
+    return _nearest(_standardize(model, df), model["centroids"]).argmin(axis=1)
+
+
+def labels(model, ids):
+    k = len(model["centroids"])
+    names = DEMAND_LABELS if k == len(DEMAND_LABELS) else [f"Segment {i + 1}" for i in range(k)]
+    return pd.Categorical.from_codes(ids, categories=names, ordered=True)
+
+
+def update(model, df):
+    """One mini-batch k-means step: each centroid moves to the running mean of its rows.
+
+    The scaler stays the one of the original fit so centroids remain
+    comparable across updates; clusters are re-ranked on their mean cnt.
+    """
+    k = len(model["centroids"])
+    X = _standardize(model, df)
+    ids = _nearest(X, model["centroids"]).argmin(axis=1)
+    counts = model["counts"] + np.bincount(ids, minlength=k)
+    sums = model["centroids"] * model["counts"][:, None]
+    np.add.at(sums, ids, X)
+    moved = counts > 0
+    centroids = model["centroids"].copy()
+    centroids[moved] = sums[moved] / counts[moved, None]
+    cnt_sums = model["cnt_sums"] + np.bincount(ids, weights=df["cnt"].to_numpy(dtype=np.float64), minlength=k)
+    return _ranked({**model, "centroids": centroids, "counts": counts, "cnt_sums": cnt_sums})
@@ -0,0 +1,182 @@
+"""Prerendered static snapshot of the data story.
+
+`python snapshot.py build` runs every page once with Streamlit's AppTest
+(so the text, figures and tables are exactly what the live app shows for
+the default widget values), waits for Part 4's background jobs, and writes
+
+* figures/<page>-<n>.json  the Plotly figure,
+* figures/<page>-<n>.html  a standalone page for it (plotly.js from the CDN),
+* figures/<page>-<n>.png   a static image, when kaleido is installed,
+* tables/<page>-<n>.csv    every table, plus an .html rendering of it,
+* manifest.json            the blocks of every page, in order.
+
+`BIKE_SNAPSHOT=<dir> streamlit run app.py` serves such a directory instead
+of running the story. The serving side only needs this module's top-level
+imports: pandas, plotly, scikit-learn and xgboost are never loaded, and a
+page view is a few file reads that are cached for the life of the process.
+Widgets are not captured; the snapshot is the story with its defaults.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import tempfile
+import time
+
+import streamlit as st
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = "snapshot"
+# Opt-in sections switched on for the snapshot
+CHECKED_BOXES = ["Run cross-validation"]
+FIGURE_HEIGHT = 450  # plotly's default when a figure sets none
+PAGE_TIMEOUT = 600
+
+_manifests = {}
+_files = {}
+
+
+def _manifest(snapshot_dir):
+    if snapshot_dir not in _manifests:
+        with open(os.path.join(snapshot_dir, "manifest.json"), encoding="utf-8") as f:
+            _manifests[snapshot_dir] = json.load(f)
+    return _manifests[snapshot_dir]
+
+
+def _read(snapshot_dir, path):
+    path = os.path.join(snapshot_dir, path)
+    if path not in _files:
+        with open(path, encoding="utf-8") as f:
+            _files[path] = f.read()
+    return _files[path]
+
+
+def _show(snapshot_dir, block):
+    kind = block["type"]
+    if kind == "heading":
+        st.markdown(f"{'#' * block['level']} {block['body']}")
+    elif kind == "markdown":
+        st.markdown(block["body"], unsafe_allow_html=block.get("html", False))
+    elif kind == "caption":
+        st.caption(block["body"])
+    elif kind in ("info", "warning", "error", "success"):
+        getattr(st, kind)(block["body"])
+    elif kind == "figure":
+        st.iframe(_read(snapshot_dir, block["html"]), height=block["height"] + 20)
+    elif kind == "table":
+        st.markdown(_read(snapshot_dir, block["html"]), unsafe_allow_html=True)
+
+
+def page(snapshot_dir, module):
+    """A page callable that replays `module`'s blocks from the snapshot in `snapshot_dir`."""
+    def run():
+        manifest = _manifest(snapshot_dir)
+        for block in manifest["pages"].get(module, []):
+            _show(snapshot_dir, block)
+        st.caption(f"Snapshot built {manifest['created']} from data {manifest['data']}.")
+    return run
+
+
+# ---------------------------------------------------------------- building
+
+_HEADING_LEVELS = {"title": 1, "header": 2, "subheader": 3}
+
+
+def _blocks(node, module, out_dir, counter):
+    import pandas as pd
+    import plotly.io as pio
+
+    blocks = []
+    for child in node.children.values():
+        kind = getattr(child, "type", None)
+        if kind in _HEADING_LEVELS:
+            blocks.append({"type": "heading", "level": _HEADING_LEVELS[kind], "body": child.proto.body})
+        elif kind == "markdown":
+            blocks.append({"type": "markdown", "body": child.value, "html": child.proto.allow_html})
+        elif kind in ("caption", "info", "warning", "error", "success"):
+            blocks.append({"type": kind, "body": child.value})
+        elif kind == "plotly_chart":
+            counter[0] += 1
+            name = f"figures/{module}-{counter[0]}"
+            fig = pio.from_json(child.proto.spec, skip_invalid=True)
+            with open(os.path.join(out_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+                f.write(child.proto.spec)
+            pio.write_html(fig, os.path.join(out_dir, f"{name}.html"), include_plotlyjs="cdn", full_html=True)
+            if importlib.util.find_spec("kaleido") is not None:
+                # Optional; the HTML is what gets served
+                pio.write_image(fig, os.path.join(out_dir, f"{name}.png"))
+            blocks.append({"type": "figure", "json": f"{name}.json", "html": f"{name}.html",
+                           "height": fig.layout.height or FIGURE_HEIGHT})
+        elif kind == "dataframe":
+            counter[0] += 1
+            name = f"tables/{module}-{counter[0]}"
+            table = child.value
+            table.to_csv(os.path.join(out_dir, f"{name}.csv"))
+            with pd.option_context("display.float_format", "{:,.4g}".format):
+                table.to_html(os.path.join(out_dir, f"{name}.html"), border=0)
+            blocks.append({"type": "table", "csv": f"{name}.csv", "html": f"{name}.html"})
+        elif hasattr(child, "children"):
+            # Columns, containers and expanders are flattened into the page
+            blocks.extend(_blocks(child, module, out_dir, counter))
+    return blocks
+
+
+def _run_page(module, checked_boxes):
+    from streamlit.testing.v1 import AppTest
+
+    import jobs
+
+    script = f"import sys\nsys.path.insert(0, {ROOT!r})\nfrom sections import {module}\n{module}.render()\n"
+    at = AppTest.from_string(script, default_timeout=PAGE_TIMEOUT)
+    at.run()
+    for checkbox in at.checkbox:
+        if checkbox.label in checked_boxes:
+            checkbox.check()
+    # Rerun until the page's background jobs have all finished
+    while True:
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{module}: {at.exception[0].message}")
+        if not jobs.active():
+            return at
+        while jobs.active():
+            time.sleep(jobs.POLL_SECONDS)
+
+
+def build(out_dir=SNAPSHOT_DIR, checked_boxes=CHECKED_BOXES):
+    """Render every page of the story into `out_dir`; returns the manifest."""
+    import plotly.io as pio
+
+    import story_data
+    from sections import PAGES
+
+    pio.templates.default = "plotly_dark"
+    for sub in ("figures", "tables"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+    pages = {}
+    for title, module, _ in PAGES:
+        start = time.perf_counter()
+        at = _run_page(module, checked_boxes)
+        pages[module] = _blocks(at.main, module, out_dir, [0])
+        print(f"{title}: {len(pages[module])} blocks in {time.perf_counter() - start:.1f}s")
+    manifest = {"created": time.strftime("%Y-%m-%d %H:%M"), "data": story_data.data_fingerprint(),
+                "pages": pages}
+    # Written last and atomically, so a server never sees a half-built snapshot
+    with tempfile.NamedTemporaryFile("w", dir=out_dir, suffix=".json", delete=False, encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(f.name, os.path.join(out_dir, "manifest.json"))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=SNAPSHOT_DIR)
+    parser.add_argument("--skip-cv", action="store_true", help="leave out the cross-validation table")
+    args = parser.parse_args()
+    build(args.out, [] if args.skip_cv else CHECKED_BOXES)
+    print(f"snapshot written to {args.out}; serve it with BIKE_SNAPSHOT={args.out} streamlit run app.py")
+
+
+if __name__ == "__main__":
+    main()
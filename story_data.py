@@ -0,0 +1,329 @@
+"""Cached data and figure helpers shared by the story sections.
+
+The frames, cubes, grids, indexes and model matrices are loaded once per
+server process with st.cache_resource and shared read-only by every session:
+the base columns stay views of the memory-mapped Feather files and nothing
+is pickled or copied per rerun. The public loaders hand each caller shallow
+views of the shared frames. Under pandas' copy-on-write, a column a session
+adds or overwrites on its view (for example `assign` or
+`df["demand_category"] = ...`) is an overlay on that session's object and
+copies only what it touches. The shared buffers and every other session are
+left alone, so resident memory stays flat as viewers are added.
+"""
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+import cube
+import data_cache
+import downsample
+import enrich
+import features
+import figure_cache
+import figures
+import forecasting
+import heatmap
+import ingest
+import partitioned
+import profiler
+import row_index
+import segmentation
+import streaming
+
+# Shallow views are only isolated from the shared frames under copy-on-write,
+# which pandas 3 always uses
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def _views(*objs):
+    # A new frame object per caller over the same column buffers
+    return tuple(o.copy(deep=False) if isinstance(o, (pd.DataFrame, pd.Series)) else o for o in objs)
+
+
+_ENRICH = {"day": enrich.enrich_day, "hour": enrich.enrich_hour}
+# Which table each cached frame, cube or index is built from
+_TABLES = {"day": "day", "hour": "hour", "day_cube": "day", "hour_cube": "hour"}
+
+# Appends update every chart straight away, but refitting all of Part 4 takes
+# minutes, so by default the models keep training on the base files only
+REFIT_ON_APPEND = os.environ.get("BIKE_REFIT_ON_APPEND", "0") == "1"
+
+
+# The base loaders take the base files' fingerprint only as their cache key,
+# so they are rebuilt when day.csv or hour.csv changes under a running server
+@st.cache_resource
+def _stream_hour(base):
+    with profiler.stage("stream hour.csv"):
+        return streaming.ingest_hour("hour.csv")
+
+
+@st.cache_resource
+def _load_base_frame(table, base):
+    # Parsed once into a memory-mapped Feather file, rebuilt when the CSV
+    # changes, then enriched with every derived column the charts need in one pass
+    if table == "hour" and streaming.ENABLED:
+        # Hour-level rows are a sample; the aggregates come from the stream
+        return _stream_hour(base)["sample"]
+    with profiler.stage("read feather cache"):
+        df = data_cache.load_table(ingest.BASE_FILES[table])
+    with profiler.stage("enrich"):
+        return _ENRICH[table](df)
+
+
+# Everything built from a table is cached per table_fingerprint(table): an
+# append to one table, or to one year, leaves the rest of the cache alone
+@st.cache_resource
+def _load_frame(table, fingerprint):
+    df = _load_base_frame(table, ingest.base_fingerprint())
+    deltas = None if table == "hour" and streaming.ENABLED else ingest.load_deltas(table)
+    if deltas is None:
+        return df
+    # Only the appended rows are enriched; the base rows are reused as they are
+    with profiler.stage("enrich appended rows"):
+        return pd.concat([df, _ENRICH[table](deltas)], ignore_index=True)
+
+
+@st.cache_resource
+def _aggregate_base_hour(base):
+    # The hourly cube and heatmap grids, from partitions of hour.csv
+    # aggregated in parallel when it is large enough to pay off
+    with profiler.stage("aggregate hour partitions"):
+        return partitioned.aggregate_hour(data_cache.load_table("hour.csv"))
+
+
+@st.cache_resource
+def _load_base_grids(base):
+    # Scanned once per base data; every resolution is served from these
+    if streaming.ENABLED:
+        return _stream_hour(base)["grids"]
+    return _aggregate_base_hour(base)["grids"]
+
+
+@st.cache_resource
+def _load_grids(fingerprint):
+    grids, delta = _load_base_grids(ingest.base_fingerprint()), ingest.delta_grids()
+    return grids if delta is None else heatmap.merge_grid_sets([grids, delta])
+
+
+@st.cache_resource
+def _load_base_cube(table, base):
+    # Sums and counts per dimension combination of a base file; appended
+    # rows are added from ingest's per-partition cubes in _load_cube
+    with profiler.stage(f"build {table} cube"):
+        if table == "day":
+            return cube.build_cube(data_cache.load_table("day.csv"), cube.DAY_DIMS)
+        if streaming.ENABLED:
+            return _stream_hour(base)["cube"]
+        return _aggregate_base_hour(base)["cube"]
+
+
+@st.cache_resource
+def _load_cube(table, fingerprint):
+    base_cube, delta = _load_base_cube(table, ingest.base_fingerprint()), ingest.delta_cube(table)
+    if delta is None:
+        return base_cube
+    with profiler.stage("merge appended cubes"):
+        return cube.merge_cubes([base_cube, delta], ingest.DIMS[table])
+
+
+@st.cache_resource
+def _load_index(name, fingerprint):
+    # Filter bitmaps over the rows or the cube cells of one table
+    table = _TABLES[name]
+    data = _load_cube(table, fingerprint) if name.endswith("_cube") else _load_frame(table, fingerprint)
+    with profiler.stage(f"build filter index ({name})"):
+        return row_index.build(data)
+
+
+@st.cache_resource(max_entries=16)
+def _load_filtered_grids(fingerprint, filters):
+    _, hour_df = load_data(filters)
+    with profiler.stage("build filtered heatmap grids"):
+        return heatmap.accumulate_grids(heatmap.empty_grids(), hour_df)
+
+
+def _filtered(frames, names, filters):
+    if not filters:
+        return frames
+    with profiler.stage("apply filters"):
+        return tuple(row_index.take(frame, row_index.select(_load_index(name, table_fingerprint(_TABLES[name])),
+                                                            filters))
+                     for frame, name in zip(frames, names))
+
+
+def _model_rows():
+    # The hourly rows Part 4 trains on (see REFIT_ON_APPEND)
+    if REFIT_ON_APPEND:
+        return _load_frame("hour", table_fingerprint("hour"))
+    return _load_base_frame("hour", ingest.base_fingerprint())
+
+
+@st.cache_resource
+def _load_features(fingerprint):
+    # Part 4's model matrix, encoded once per model fingerprint
+    hour_df = _model_rows()
+    with profiler.stage("encode features"):
+        encoder = features.fit_encoder(hour_df)
+        # Written once per fit for the prediction service, not on every rerun
+        features.save_encoder(encoder)
+        X = features.transform(encoder, hour_df)
+        # Shared by every session, so writes must fail instead of leaking
+        X.setflags(write=False)
+        return encoder, X, hour_df["cnt"].copy()
+
+
+@st.cache_resource
+def _load_forecast_features(fingerprint, horizon):
+    # Lag and rolling features per forecast horizon, built once per model fingerprint
+    hour_df = _model_rows()
+    encoder, _, _ = _load_features(fingerprint)
+    with profiler.stage(f"build forecast features (t+{horizon}h)"):
+        X, y = forecasting.build_features(encoder, hour_df, horizon)
+        train, test = forecasting.chronological_split(hour_df)
+        return X, y, train, test, forecasting.seasonal_naive(hour_df, horizon)
+
+
+@st.cache_resource
+def _load_segmentation(granularity, fingerprint):
+    if granularity == "Days" and ingest.demand_segments() is not None:
+        # Kept current by ingest.append instead of refitting over every day
+        return ingest.demand_segments()
+    with profiler.stage(f"fit segmentation ({granularity.lower()})"):
+        return segmentation.fit(_load_frame("day" if granularity == "Days" else "hour", fingerprint))
+
+
+# The timed wrappers include st.cache_resource's own cost (hashing the arguments) on a hit
+def load_data(filters=None, tables=("day", "hour")):
+    """(day_df, hour_df), restricted to the rows matching `filters` (see show_filters).
+
+    `tables` picks which frames are loaded and returned, in that order.
+    """
+    with profiler.stage("load data"):
+        frames = _views(*(_load_frame(table, table_fingerprint(table)) for table in tables))
+    return _filtered(frames, tables, filters)
+
+
+def load_cubes(filters=None):
+    """(day_cube, hour_cube), restricted to the cells matching `filters`."""
+    with profiler.stage("load cubes"):
+        cubes = _views(*(_load_cube(table, table_fingerprint(table)) for table in ("day", "hour")))
+    return _filtered(cubes, ("day_cube", "hour_cube"), filters)
+
+
+def load_features():
+    """(encoder, model matrix as a float32 DataFrame, target) for Part 4."""
+    with profiler.stage("load features"):
+        encoder, X, y = _load_features(model_fingerprint())
+        return encoder, features.frame(encoder, X, y.index), y.copy(deep=False)
+
+
+def load_forecast_features(horizon):
+    """(X, y, train labels, test labels, seasonal-naive forecast) for `horizon` hours ahead."""
+    with profiler.stage("load forecast features"):
+        return _views(*_load_forecast_features(model_fingerprint(), horizon))
+
+
+def load_segmentation(granularity="Days"):
+    """Demand segmentation of the days or hours, cached per version of that table."""
+    return _load_segmentation(granularity, table_fingerprint("day" if granularity == "Days" else "hour"))
+
+
+def load_heatmap_grid(x="temp", y="hum", filters=None):
+    """Fine x by y grid (heatmap.PAIRS) of all rows, appended ones included.
+
+    With `filters` the grid is accumulated from the matching hourly rows
+    (the sample in streaming mode) and cached per selection.
+    """
+    with profiler.stage("load heatmap grid"):
+        if filters:
+            return _load_filtered_grids(table_fingerprint("hour", filters.get("yr")), filters)[f"{x}:{y}"]
+        return _load_grids(table_fingerprint("hour"))[f"{x}:{y}"]
+
+
+FILTER_LABELS = {
+    "yr": ("Year", lambda v: str(ingest.FIRST_YEAR + v)),
+    "season": ("Season", lambda v: enrich.SEASON_NAMES[v - 1]),
+    "weathersit": ("Weather", lambda v: enrich.WEATHER_NAMES[v - 1]),
+    "holiday": ("Holiday", lambda v: "Yes" if v else "No"),
+    "workingday": ("Working day", lambda v: "Yes" if v else "No"),
+}
+
+
+def show_filters():
+    """Sidebar filters for the charts of a page; returns {dim: allowed codes}.
+
+    Only dimensions that exclude a value are returned, so an untouched
+    sidebar gives {} and the unfiltered cached data and figures.
+    """
+    indexes = {table: _load_index(table, table_fingerprint(table)) for table in ("day", "hour")}
+    st.sidebar.markdown("**Filters**")
+    filters = {}
+    for dim in row_index.FILTER_DIMS:
+        label, format_value = FILTER_LABELS[dim]
+        values = sorted(set(indexes["day"]["bitmaps"][dim]) | set(indexes["hour"]["bitmaps"][dim]))
+        chosen = st.sidebar.multiselect(label, values, default=values, format_func=format_value, key=f"filter_{dim}")
+        if set(chosen) != set(values):
+            filters[dim] = sorted(chosen)
+    if not filters:
+        return filters
+    with profiler.stage("apply filters"):
+        matching = row_index.select(indexes["hour"], filters)
+    if not len(matching):
+        st.sidebar.warning("No hours match these filters; the charts show all rows.")
+        return {}
+    st.sidebar.caption(f"{len(matching):,} of {indexes['hour']['rows']:,} hourly rows match.")
+    return filters
+
+
+def show_sample_caption():
+    if streaming.ENABLED:
+        stream = _stream_hour(ingest.base_fingerprint())
+        st.caption(f"Streaming mode: aggregate charts cover all {stream['rows']:,} hourly rows; "
+                   f"charts and models that need individual rows use a uniform sample of {len(stream['sample']):,}.")
+
+
+def show_model_data_caption():
+    appended = ingest.appended_rows("hour")
+    if appended and not REFIT_ON_APPEND:
+        st.caption(f"The models are trained on hour.csv; the {appended:,} appended hourly rows are left out so "
+                   "an append does not refit every model. Set BIKE_REFIT_ON_APPEND=1 to include them.")
+
+
+def table_fingerprint(table, years=None):
+    """Version of `table`'s rows in `years` (yr codes; all years when None).
+
+    The base file digests plus the version of the partitions appended to the
+    table in those years, so it only changes when those rows do.
+    """
+    years = None if years is None else sorted(years)
+    return f"{ingest.base_fingerprint()}:{table}{years or ''}:{ingest.partition_version(table, years)}"
+
+
+def data_fingerprint():
+    # Every row of both tables
+    return f"{table_fingerprint('day')}|{table_fingerprint('hour')}"
+
+
+def model_fingerprint():
+    """Version of the rows Part 4 trains on: the base files unless REFIT_ON_APPEND."""
+    return table_fingerprint("hour") if REFIT_ON_APPEND else f"{ingest.base_fingerprint()}:base"
+
+
+def cached_figure(builder, *data, source, filters=None, **params):
+    # Figures are built once per version of the `source` table's rows they can
+    # show (only the filtered years when filtering on yr), filter selection and
+    # chart parameters, and shared across sessions
+    fingerprint = table_fingerprint(source, (filters or {}).get("yr"))
+    if filters:
+        fingerprint += ":" + json.dumps(filters, sort_keys=True)
+    with profiler.stage(f"figure: {builder.__name__}"):
+        return figure_cache.get(builder, fingerprint, *data, **params)
+
+
+def show_downsample_caption(fig):
+    info = figures.downsample_info(fig)
+    if info and downsample.describe(info):
+        st.caption(downsample.describe(info))
@@ -0,0 +1,50 @@
+"""Chunked ingestion of hour-level data that does not fit in memory.
+
+`ingest_hour` makes one pass over hour.csv (or its memory-mapped Feather
+cache) with data_cache.iter_chunks and keeps only running aggregates:
+
+* the hourly cube (cube.merge_cubes of per-chunk cubes),
+* the weather heatmap grids (heatmap.accumulate_grids), and
+* a uniform reservoir sample of rows for the charts and models that need
+  individual rows.
+
+Memory is bounded by the chunk size, the cube cells and the sample size,
+never by the number of rows. Enable it with BIKE_STREAMING=1.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import cube
+import data_cache
+import enrich
+import heatmap
+
+ENABLED = os.environ.get("BIKE_STREAMING", "0") == "1"
+SAMPLE_ROWS = int(os.environ.get("BIKE_SAMPLE_ROWS", 50_000))
+
+
+def reservoir(sample, chunk, size, rng):
+    """Keep the `size` rows with the smallest random keys seen so far.
+
+    Every row gets an independent uniform key, so after any number of chunks
+    the kept rows are a uniform sample without replacement.
+    """
+    keyed = chunk.assign(_key=rng.random(len(chunk)))
+    if sample is not None:
+        keyed = pd.concat([sample, keyed], ignore_index=True)
+    return keyed.nsmallest(size, "_key") if len(keyed) > size else keyed
+
+
+def ingest_hour(csv_path="hour.csv", chunk_rows=data_cache.CHUNK_ROWS, sample_rows=SAMPLE_ROWS, seed=42):
+    rng = np.random.default_rng(seed)
+    hour_cube, grids, sample, rows = None, heatmap.empty_grids(), None, 0
+    for chunk in data_cache.iter_chunks(csv_path, chunk_rows):
+        rows += len(chunk)
+        chunk_cube = cube.build_cube(chunk, cube.HOUR_DIMS)
+        hour_cube = chunk_cube if hour_cube is None else cube.merge_cubes([hour_cube, chunk_cube], cube.HOUR_DIMS)
+        heatmap.accumulate_grids(grids, chunk)
+        sample = reservoir(sample, chunk, sample_rows, rng)
+    sample = sample.drop(columns="_key").sort_values("instant").reset_index(drop=True)
+    return {"rows": rows, "cube": hour_cube, "grids": grids, "sample": enrich.enrich_hour(sample)}
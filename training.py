@@ -0,0 +1,134 @@
+"""Parallel training scheduler for the Part 4 model comparison.
+
+Models missing from the model store are fanned out over a process pool.
+Ensemble models get an `n_jobs` share of the cores so the pool as a whole
+never runs more threads than there are CPUs, the slowest models are
+submitted first, and every fit is bounded by a per-model timeout.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+# loky workers do not re-run the Streamlit script as __main__ the way
+# multiprocessing's spawn/forkserver children do, and avoid fork+OpenMP hangs
+from joblib.externals.loky import ProcessPoolExecutor
+
+import model_store
+
+TRAIN_WORKERS = int(os.environ.get("BIKE_TRAIN_WORKERS", os.cpu_count() or 1))
+MODEL_TIMEOUT = float(os.environ.get("BIKE_MODEL_TIMEOUT", 600))
+POLL_SECONDS = 0.25
+
+# Rough relative fit cost on hour.csv, used to submit the slowest fits first
+_COST_HINTS = {
+    "SVR": 100, "ExtraTreesRegressor": 40, "RandomForestRegressor": 40,
+    "GradientBoostingRegressor": 20, "XGBRegressor": 10, "KNeighborsRegressor": 5,
+    "HuberRegressor": 3, "DecisionTreeRegressor": 2,
+}
+
+
+def fit_cost(model):
+    return _COST_HINTS.get(type(model).__name__, 1)
+
+
+def share_cores(models, workers):
+    """Give each model an `n_jobs` share of the cores; returns the worker env capping BLAS/OpenMP."""
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    for model in models:
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=threads)
+    return {var: str(threads) for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")}
+
+
+def _fit_job(name, key, model, X_train, y_train, X_test, y_test):
+    # The fitted model stays in the store; only the scores travel back
+    entry = model_store.fit_and_score(model, X_train, y_train, X_test, y_test)
+    model_store.save(name, key, entry)
+    return {"MSE": entry["MSE"], "R²": entry["R²"]}
+
+
+def run_in_pool(tasks, timeout, workers, env=None):
+    """Run `tasks`, (tag, fn, args) tuples, over `workers` processes in the given order.
+
+    Yields (tag, result, error) as each task finishes, where `error` is the
+    exception it raised, or a TimeoutError once it has run for `timeout` seconds.
+    A single worker is still a separate process: a fit running in this one
+    could not be stopped when it overruns.
+    """
+    queue = deque(tasks)
+    pending = {}
+    executor = None
+    try:
+        while queue or pending:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=workers, env=env)
+            # No more tasks than workers are in flight, so a task's clock starts when it does
+            while queue and len(pending) < workers:
+                task = queue.popleft()
+                pending[executor.submit(task[1], *task[2])] = (task, time.monotonic())
+            done, _ = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                (tag, _, _), _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    yield tag, None, e
+                else:
+                    yield tag, result, None
+            now = time.monotonic()
+            overdue = [future for future, (_, started) in pending.items() if now - started > timeout]
+            if overdue:
+                for future in overdue:
+                    (tag, _, _), _ = pending.pop(future)
+                    yield tag, None, TimeoutError(f"Timed out after {timeout:.0f}s")
+                # A timed-out fit keeps its worker busy, so kill the pool and
+                # start the tasks it was still running again in a fresh one
+                executor.shutdown(wait=False, kill_workers=True)
+                executor = None
+                queue.extendleft(reversed([task for task, _ in pending.values()]))
+                pending = {}
+    finally:
+        if executor is not None:
+            # Tasks still pending here were abandoned by the caller
+            executor.shutdown(wait=not pending, kill_workers=bool(pending))
+
+
+def _error(message):
+    return {"MSE": "Error", "R²": message}
+
+
+def train_models(models, X_train, y_train, X_test, y_test, data_digest,
+                 max_workers=None, timeout=None, on_result=None):
+    """Fit and score every model, calling `on_result(name, scores)` as each finishes.
+
+    Returns {name: {"MSE", "R²"}} in the order of `models`.
+    """
+    max_workers = max_workers or TRAIN_WORKERS
+    timeout = timeout or MODEL_TIMEOUT
+    results = {}
+
+    def publish(name, scores):
+        results[name] = scores
+        if on_result is not None:
+            on_result(name, scores)
+
+    # Anything already in the store is reported straight away
+    todo = []
+    for name, model in models.items():
+        key = model_store.entry_key(name, model, X_train, X_test, data_digest)
+        # Only the scores file is read; the estimator stays on disk
+        scores = model_store.load_scores(name, key)
+        if scores is not None:
+            publish(name, scores)
+        else:
+            todo.append((name, key, model))
+
+    workers = max(1, min(max_workers, len(todo)))
+    # Also caps BLAS/OpenMP pools inside each worker, beyond the explicit n_jobs
+    thread_env = share_cores([model for _, _, model in todo], workers)
+    todo.sort(key=lambda job: fit_cost(job[2]), reverse=True)
+    tasks = [(name, _fit_job, (name, key, model, X_train, y_train, X_test, y_test)) for name, key, model in todo]
+    for name, scores, error in run_in_pool(tasks, timeout, workers, thread_env):
+        publish(name, _error(str(error)) if error is not None else scores)
+    return {name: results[name] for name in models if name in results}